@@ -0,0 +1,122 @@
+"""Write throughput on a single hot report as the shard count grows.
+
+Firestore limits sustained writes to any one document (about 1/s), which is
+what makes a popular report a bottleneck. This benchmark reproduces that limit
+in-process: every simulated document serializes its writes and can accept at
+most one every --write-interval seconds. Concurrent voters then hammer one
+report through sharded_counter.increment() and we report committed votes per
+second for each shard count.
+
+    python benchmarks/bench_sharded_counter.py --shards 1 2 4 8 16
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from road_maintenance import sharded_counter  # noqa: E402
+
+
+class _Snapshot:
+    def __init__(self, data):
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class ThrottledDocument:
+    """A document that, like Firestore, admits one write per `write_interval`."""
+
+    def __init__(self, path, write_interval):
+        self.path = path
+        self._write_interval = write_interval
+        self._lock = threading.Lock()
+        self._next_write = 0.0
+        self._data = {}
+        self._collections = {}
+
+    def collection(self, name):
+        if name not in self._collections:
+            self._collections[name] = ThrottledCollection(f"{self.path}/{name}", self._write_interval)
+        return self._collections[name]
+
+    def set(self, data, merge=False):
+        with self._lock:
+            wait = self._next_write - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            if not merge:
+                self._data = {}
+            for key, value in data.items():
+                increment = getattr(value, 'value', None)
+                if increment is not None:
+                    self._data[key] = self._data.get(key, 0) + increment
+                else:
+                    self._data[key] = value
+            self._next_write = time.perf_counter() + self._write_interval
+
+
+class ThrottledCollection:
+    def __init__(self, path, write_interval):
+        self.path = path
+        self._write_interval = write_interval
+        self._docs = {}
+        self._lock = threading.Lock()
+
+    def document(self, doc_id):
+        with self._lock:
+            if doc_id not in self._docs:
+                self._docs[doc_id] = ThrottledDocument(f"{self.path}/{doc_id}", self._write_interval)
+            return self._docs[doc_id]
+
+    def stream(self):
+        with self._lock:
+            docs = list(self._docs.values())
+        return [_Snapshot(doc._data) for doc in docs]
+
+
+def run(num_shards, writers, duration, write_interval):
+    report = ThrottledDocument('reports/hot', write_interval)
+    stop = threading.Event()
+
+    def voter():
+        while not stop.is_set():
+            sharded_counter.increment(report, 'votes', num_shards=num_shards)
+
+    threads = [threading.Thread(target=voter) for _ in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    votes = sharded_counter.read_counts(report)['votes']
+    return votes, votes / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--writers', type=int, default=32, help="concurrent voting threads")
+    parser.add_argument('--duration', type=float, default=2.0, help="seconds per run")
+    parser.add_argument('--write-interval', type=float, default=0.01,
+                        help="minimum seconds between writes to one document")
+    args = parser.parse_args()
+
+    print(f"{'shards':>6} {'votes':>8} {'votes/s':>10} {'speedup':>8}")
+    baseline = None
+    for num_shards in args.shards:
+        votes, rate = run(num_shards, args.writers, args.duration, args.write_interval)
+        baseline = baseline or rate
+        print(f"{num_shards:>6} {votes:>8} {rate:>10.1f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
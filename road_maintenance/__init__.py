@@ -0,0 +1,21 @@
+import os
+import secrets
+
+from .models import Report, ValidationError
+
+__all__ = ['Report', 'ValidationError', 'create_app']
+
+
+def create_app():
+    """Builds the Flask app serving the citizen frontend, the admin console and the JSON API."""
+    from flask import Flask
+
+    from . import admin, citizen, firebase, profiling
+
+    app = Flask(__name__)
+    app.secret_key = os.environ.get("SECRET_KEY") or secrets.token_hex(16)
+    firebase.init()
+    profiling.init_app(app)
+    app.register_blueprint(citizen.bp)
+    app.register_blueprint(admin.bp)
+    return app
@@ -0,0 +1,141 @@
+import functools
+
+from flask import Blueprint, current_app, jsonify, render_template_string, request, send_file, session, url_for
+
+from . import archive, firebase, idempotency, offline, profiling, reports, status_events, work_queue
+from .models import ValidationError, validate_status
+from .templates import ADMIN_HTML
+
+# --- Admin Console ---
+# Crew-facing pages and endpoints. Everything except the page itself and
+# /login requires a logged-in session.
+
+bp = Blueprint('admin', __name__)
+
+# Hardcoded credentials for this example
+ADMIN_USERNAME = 'admin'
+ADMIN_PASSWORD = 'password'
+
+
+def admin_required(view):
+    """Rejects requests without a logged-in admin session with 403.
+
+    Apply it outside @idempotency.idempotent() so unauthenticated requests
+    are turned away before their Idempotency-Key is looked up or stored.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not session.get('logged_in'):
+            return jsonify({"error": "Unauthorized"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
+
+@bp.route('/admin', methods=['GET'])
+def index():
+    return render_template_string(
+        ADMIN_HTML, offline_script=offline.page_script(url_for('citizen.handle_report_batch')))
+
+@bp.route('/login', methods=['POST'])
+def login():
+    data = request.json
+    username = data.get('username')
+    password = data.get('password')
+
+    if username == ADMIN_USERNAME and password == ADMIN_PASSWORD:
+        session['logged_in'] = True
+        return jsonify({"message": "Login successful"}), 200
+    else:
+        return jsonify({"error": "Invalid username or password"}), 401
+
+@bp.route('/update_status', methods=['POST'])
+@admin_required
+@idempotency.idempotent()
+def update_status():
+    data = request.json
+    report_id = data.get('id')
+    new_status = data.get('status')
+
+    try:
+        with profiling.span('firestore.update_status', report=report_id):
+            reports.update_report_status(firebase.db, report_id, validate_status(new_status))
+        return jsonify({"message": "Status updated successfully"}), 200
+    except ValidationError as e:
+        return jsonify({"error": str(e)}), 400
+    except KeyError:
+        return jsonify({"error": "Report not found"}), 404
+    except Exception as e:
+        print(f"Error updating report status in Firestore: {e}")
+        return jsonify({"error": "Failed to update status"}), 500
+
+@bp.route('/work_queue', methods=['GET'])
+def get_work_queue():
+    if not session.get('logged_in'):
+        return jsonify({"error": "Unauthorized"}), 403
+
+    ward = request.args.get('ward') or work_queue.UNASSIGNED_WARD
+    try:
+        with profiling.span('firestore.load_open_jobs', ward=ward):
+            jobs = work_queue.load_open_jobs(firebase.db, ward)
+        return jsonify(jobs), 200
+    except Exception as e:
+        print(f"Error loading work queue from Firestore: {e}")
+        return jsonify({"error": "Failed to load work queue"}), 500
+
+@bp.route('/archive_search', methods=['GET'])
+def search_archive():
+    if not session.get('logged_in'):
+        return jsonify({"error": "Unauthorized"}), 403
+
+    try:
+        limit = min(int(request.args.get('limit', 100)), 500)
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+
+    try:
+        results = archive.search_archive(
+            text=request.args.get('q'),
+            issue_type=request.args.get('issue_type'),
+            ward=request.args.get('ward'),
+            limit=limit)
+        return jsonify(results), 200
+    except Exception as e:
+        print(f"Error searching report archive: {e}")
+        return jsonify({"error": "Failed to search archive"}), 500
+
+@bp.route('/sla_metrics', methods=['GET'])
+def get_sla_metrics():
+    if not session.get('logged_in'):
+        return jsonify({"error": "Unauthorized"}), 403
+
+    try:
+        with profiling.span('firestore.sla_metrics'):
+            metrics = status_events.sla_metrics(firebase.db)
+        return jsonify(metrics), 200
+    except Exception as e:
+        print(f"Error computing SLA metrics: {e}")
+        return jsonify({"error": "Failed to compute SLA metrics"}), 500
+
+@bp.route('/slow_requests', methods=['GET'])
+def list_slow_requests():
+    """Lists the slowest recently captured requests (see profiling.py)."""
+    if not session.get('logged_in'):
+        return jsonify({"error": "Unauthorized"}), 403
+
+    try:
+        limit = min(int(request.args.get('limit', 20)), profiling.PROFILE_MAX_REQUESTS)
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+    return jsonify(profiling.slow_requests(current_app.config['PROFILE_DIR'], limit)), 200
+
+@bp.route('/slow_requests/<profile_id>/<kind>', methods=['GET'])
+def download_profile(profile_id, kind):
+    """Downloads one captured profile file: prof, collapsed or json."""
+    if not session.get('logged_in'):
+        return jsonify({"error": "Unauthorized"}), 403
+
+    path = profiling.profile_path(current_app.config['PROFILE_DIR'], profile_id, kind)
+    if not path:
+        return jsonify({"error": "Profile not found"}), 404
+    return send_file(path, as_attachment=kind != 'json', download_name=f"{profile_id}.{kind}")
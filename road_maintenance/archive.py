@@ -0,0 +1,203 @@
+import argparse
+import gzip
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from google.api_core.exceptions import FailedPrecondition
+
+from . import sharded_counter
+from .models import Report
+
+# --- Archival of Resolved Reports ---
+# Reports that have been Completed for longer than a retention window are
+# moved out of the hot `reports` collection into gzip-compressed NDJSON
+# segments, so dashboard queries only ever scan open and recently resolved
+# work. Each archived record carries its status events and final engagement
+# counts; its photo is moved to a cold storage class. Segments can optionally
+# be copied to the bucket under archive/ as well.
+#
+# Intended to be run on a schedule, e.g. nightly from cron:
+#     python -m road_maintenance.archive --days 365 --upload
+
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", "archive")
+ARCHIVE_AFTER_DAYS = int(os.environ.get("ARCHIVE_AFTER_DAYS", 365))
+ARCHIVE_BATCH_SIZE = 200
+COLD_STORAGE_CLASS = 'COLDLINE'
+_MAX_BATCH_WRITES = 450
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _write_segment(records, archive_dir):
+    os.makedirs(archive_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+    name = f"segment-{stamp}-{uuid.uuid4().hex[:8]}.ndjson.gz"
+    path = os.path.join(archive_dir, name)
+    tmp_path = path + '.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, default=_json_default) + '\n')
+    with open(tmp_path, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+def _delete_batch(db, entries):
+    """Deletes each report with its events and shards, unless the report changed since it was read.
+
+    `entries` are (snapshot, child_refs) pairs. Every report's deletes share
+    one batch, so a failed precondition leaves that report fully intact.
+    Returns the IDs of the reports that were deleted.
+    """
+    chunks, chunk, writes = [], [], 0
+    for snapshot, child_refs in entries:
+        if chunk and writes + len(child_refs) + 1 > _MAX_BATCH_WRITES:
+            chunks.append(chunk)
+            chunk, writes = [], 0
+        chunk.append((snapshot, child_refs))
+        writes += len(child_refs) + 1
+    if chunk:
+        chunks.append(chunk)
+
+    deleted = set()
+    for chunk in chunks:
+        if _commit_deletes(db, chunk):
+            deleted.update(snapshot.id for snapshot, _ in chunk)
+        elif len(chunk) > 1:
+            # Find which report changed by retrying them one at a time.
+            for entry in chunk:
+                if _commit_deletes(db, [entry]):
+                    deleted.add(entry[0].id)
+    return deleted
+
+
+def _commit_deletes(db, entries):
+    batch = db.batch()
+    for snapshot, child_refs in entries:
+        for ref in child_refs:
+            batch.delete(ref)
+        batch.delete(snapshot.reference, option=db.write_option(last_update_time=snapshot.update_time))
+    try:
+        batch.commit()
+        return True
+    except FailedPrecondition:
+        return False
+
+
+def archive_completed(db, bucket, older_than_days=ARCHIVE_AFTER_DAYS, archive_dir=ARCHIVE_DIR, upload=False):
+    """Moves reports Completed more than `older_than_days` ago into archive segments.
+
+    Each batch is written to a segment and flushed to disk before any of its
+    reports are deleted from Firestore. A report is only deleted if it has not
+    changed since it was read (e.g. reopened by a crew); such reports stay in
+    Firestore and are dropped from the segment. Returns the number of reports
+    archived.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    query = (db.collection('reports')
+             .where('status', '==', 'Completed')
+             .where('status_updated_at', '<', cutoff)
+             .limit(ARCHIVE_BATCH_SIZE))
+
+    archived = 0
+    while True:
+        docs = list(query.stream())
+        if not docs:
+            return archived
+
+        records = []
+        entries = []
+        for doc in docs:
+            record = Report.from_firestore(doc.id, doc.to_dict()).to_api()
+            record['engagement'] = sharded_counter.read_counts(doc.reference)
+            events = list(doc.reference.collection('events').stream())
+            record['events'] = [event.to_dict() for event in events]
+            records.append(record)
+            child_refs = [event.reference for event in events]
+            child_refs.extend(shard.reference for shard in doc.reference.collection('shards').stream())
+            entries.append((doc, child_refs))
+
+        path = _write_segment(records, archive_dir)
+        deleted = _delete_batch(db, entries)
+        if len(deleted) < len(records):
+            print(f"Skipped {len(records) - len(deleted)} reports that changed while being archived.")
+            records = [record for record in records if record['id'] in deleted]
+            stale_path = path
+            path = _write_segment(records, archive_dir) if records else None
+            os.remove(stale_path)
+        if not records:
+            # Every report in this batch changed; any still eligible are picked up again.
+            continue
+
+        if upload and bucket:
+            blob = bucket.blob(f"archive/{os.path.basename(path)}")
+            blob.storage_class = COLD_STORAGE_CLASS
+            blob.upload_from_filename(path)
+
+        archived += len(records)
+
+        # Tiering is best-effort: the reports are already archived, so a failed
+        # storage-class rewrite only leaves that photo in the standard class.
+        if bucket:
+            for record in records:
+                if record.get('photo_path'):
+                    try:
+                        bucket.blob(record['photo_path']).update_storage_class(COLD_STORAGE_CLASS)
+                    except Exception as e:
+                        print(f"Error moving {record['photo_path']} to {COLD_STORAGE_CLASS}: {e}")
+
+
+def search_archive(archive_dir=ARCHIVE_DIR, text=None, issue_type=None, ward=None, limit=100):
+    """Scans archive segments (newest first) for reports matching every given filter.
+
+    Only segments on this host's disk are searched; copies uploaded with
+    --upload are not read back. Every call decompresses and scans the
+    segments, so this is meant for occasional admin lookups.
+    """
+    if not os.path.isdir(archive_dir):
+        return []
+    text = text.lower() if text else None
+    segments = sorted((name for name in os.listdir(archive_dir) if name.endswith('.ndjson.gz')), reverse=True)
+
+    results = []
+    seen = set()
+    for name in segments:
+        with gzip.open(os.path.join(archive_dir, name), 'rt', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                # A run interrupted between writing a segment and deleting its
+                # reports archives them again on the next run.
+                if record['id'] in seen:
+                    continue
+                if issue_type and record.get('issue_type') != issue_type:
+                    continue
+                if ward and record.get('ward') != ward:
+                    continue
+                if text and text not in f"{record.get('description', '')} {record.get('location', '')}".lower():
+                    continue
+                seen.add(record['id'])
+                results.append(record)
+                if len(results) >= limit:
+                    return results
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Archive reports completed more than N days ago")
+    parser.add_argument('--days', type=int, default=ARCHIVE_AFTER_DAYS)
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    parser.add_argument('--upload', action='store_true', help="also copy segments to the bucket under archive/")
+    args = parser.parse_args()
+
+    from . import firebase
+
+    db, bucket = firebase.init()
+    count = archive_completed(db, bucket, args.days, args.archive_dir, args.upload)
+    print(f"Archived {count} reports.")
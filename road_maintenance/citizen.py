@@ -0,0 +1,313 @@
+import json
+import os
+
+from flask import Blueprint, Response, jsonify, redirect, render_template_string, request, send_file, url_for
+from google.api_core.exceptions import AlreadyExists
+
+from . import (firebase, idempotency, offline, photos, profiling, reports, sharded_counter, status_events,
+               tiles, work_queue)
+from .admin import admin_required
+from .models import Report, ValidationError, validate_status
+from .templates import CITIZEN_HTML
+
+# --- Citizen Frontend and Public API ---
+# The older single-purpose URLs (/report, /report_batch, /dashboard_data,
+# /vote) are kept as aliases of their /api/ equivalents so existing clients
+# and already-installed service workers keep working.
+
+bp = Blueprint('citizen', __name__)
+
+MAX_BATCH_REPORTS = 25
+
+
+def _submission_fields():
+    """Returns the submitted report fields from either a form post or a JSON body."""
+    if request.form:
+        return request.form
+    return request.get_json(silent=True) or {}
+
+
+def serialize(report):
+    """Returns the API representation of a Report, with photo links routed through this app."""
+    data = report.to_api()
+    if report.photo_path:
+        data['photo_url'] = url_for('citizen.serve_photo', blob_name=report.photo_path)
+        data['thumbnail_url'] = url_for('citizen.serve_thumbnail', blob_name=report.photo_path)
+    return data
+
+
+def store_report(fields, photo_file, doc_ref=None):
+    """Validates a submission, uploads its optional photo and creates the report.
+
+    Raises ValidationError for invalid fields. Returns the DocumentReference.
+    """
+    report = Report.from_submission(fields)
+    if doc_ref is None:
+        doc_ref = firebase.db.collection('reports').document()
+
+    if photo_file:
+        if not firebase.bucket:
+            raise RuntimeError("Photo uploads are not configured.")
+        file_extension = os.path.splitext(photo_file.filename)[1]
+        blob_name = f'{photos.PHOTO_PREFIX}{doc_ref.id}{file_extension}'
+        blob = firebase.bucket.blob(blob_name)
+        with profiling.span('gcs.upload', blob=blob_name):
+            blob.upload_from_file(photo_file, content_type=photo_file.mimetype)
+        report.photo_path = blob_name
+
+    with profiling.span('firestore.create_report'):
+        return reports.create_report(firebase.db, report, doc_ref)
+
+
+@bp.route('/')
+def serve_frontend():
+    """Serves the citizen reporting page."""
+    return render_template_string(
+        CITIZEN_HTML, offline_script=offline.page_script(url_for('citizen.handle_report_batch')))
+
+@bp.route('/sw.js')
+def serve_service_worker():
+    """Serves the service worker that caches the app shell and syncs queued reports."""
+    return Response(offline.service_worker_js(url_for('citizen.handle_report_batch')),
+                    mimetype='application/javascript', headers={'Cache-Control': 'no-cache'})
+
+@bp.route('/report', methods=['POST'])
+@bp.route('/api/report', methods=['POST'])
+@idempotency.idempotent()
+def handle_report():
+    """Receives a report (form post with optional photo, or JSON) and stores it in Firebase."""
+    if not firebase.db:
+        return jsonify({"error": "Firebase is not configured."}), 500
+
+    # With an Idempotency-Key the document ID is derived from the key, so a
+    # retry that outlived the response store still cannot create a duplicate.
+    key = idempotency.idempotency_key()
+    doc_ref = reports.doc_ref_for_key(firebase.db, key) if key else None
+    try:
+        # Checked before the photo upload so a retry never writes to Cloud Storage again.
+        if doc_ref is not None:
+            with profiling.span('firestore.get', doc=doc_ref.id):
+                exists = doc_ref.get().exists
+            if exists:
+                return jsonify({"message": "Report submitted", "id": doc_ref.id}), 200
+        doc_ref = store_report(_submission_fields(), request.files.get('issue_photo'), doc_ref)
+        return jsonify({"message": "Report submitted", "id": doc_ref.id}), 200
+    except ValidationError as e:
+        return jsonify({"error": str(e)}), 400
+    except AlreadyExists:
+        return jsonify({"message": "Report submitted", "id": doc_ref.id}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/report_batch', methods=['POST'])
+@bp.route('/api/reports/batch', methods=['POST'])
+def handle_report_batch():
+    """Stores reports queued offline. Each carries an idempotency key, so replays are no-ops."""
+    if not firebase.db:
+        return jsonify({"error": "Firebase is not configured."}), 500
+
+    try:
+        items = json.loads(request.form.get('reports', '[]'))
+    except ValueError:
+        return jsonify({"error": "Malformed reports payload"}), 400
+    if not isinstance(items, list) or len(items) > MAX_BATCH_REPORTS:
+        return jsonify({"error": f"Expected a list of at most {MAX_BATCH_REPORTS} reports"}), 400
+
+    results = []
+    for item in items:
+        key = item.get('key') if isinstance(item, dict) else None
+        if not isinstance(key, str) or not reports.IDEMPOTENCY_KEY_PATTERN.match(key):
+            results.append({"key": key, "status": "invalid", "error": "Missing or malformed key"})
+            continue
+
+        doc_ref = reports.doc_ref_for_key(firebase.db, key)
+        try:
+            with profiling.span('firestore.get', doc=doc_ref.id):
+                exists = doc_ref.get().exists
+            if exists:
+                results.append({"key": key, "id": doc_ref.id, "status": "duplicate"})
+                continue
+            store_report(item, request.files.get(f'photo_{key}'), doc_ref)
+            results.append({"key": key, "id": doc_ref.id, "status": "created"})
+        except ValidationError as e:
+            results.append({"key": key, "status": "invalid", "error": str(e)})
+        except AlreadyExists:
+            results.append({"key": key, "id": doc_ref.id, "status": "duplicate"})
+        except Exception as e:
+            results.append({"key": key, "status": "error", "error": str(e)})
+
+    return jsonify({"results": results}), 200
+
+@bp.route('/dashboard_data')
+@bp.route('/api/dashboard')
+def get_dashboard_data():
+    """Fetches all reports from Firebase."""
+    if not firebase.db:
+        return jsonify({"error": "Firebase is not configured."}), 500
+
+    try:
+        # stream() is lazy; the span covers iterating it, i.e. the actual reads.
+        with profiling.span('firestore.stream', collection='reports'):
+            docs = list(firebase.db.collection('reports').stream())
+        with profiling.span('serialize', count=len(docs)):
+            data = [serialize(Report.from_firestore(doc.id, doc.to_dict())) for doc in docs]
+        with profiling.span('jsonify'):
+            response = jsonify(data)
+        return response, 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/update-status', methods=['POST'])
+@admin_required
+@idempotency.idempotent()
+def update_status():
+    """Updates the status of a specific report in Firebase. Requires an admin session."""
+    if not firebase.db:
+        return jsonify({"error": "Firebase is not configured."}), 500
+
+    data = request.json
+    report_id = data.get('id')
+    new_status = data.get('status')
+
+    if not report_id or not new_status:
+        return jsonify({"error": "Missing ID or status"}), 400
+
+    try:
+        with profiling.span('firestore.update_status', report=report_id):
+            reports.update_report_status(firebase.db, report_id, validate_status(new_status))
+        return jsonify({"message": "Status updated"}), 200
+    except ValidationError as e:
+        return jsonify({"error": str(e)}), 400
+    except KeyError:
+        return jsonify({"error": "Report not found"}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/work-queue')
+def get_work_queue():
+    """Returns the open (Reported / In Progress) reports for one ward."""
+    if not firebase.db:
+        return jsonify({"error": "Firebase is not configured."}), 500
+
+    ward = request.args.get('ward') or work_queue.UNASSIGNED_WARD
+    try:
+        with profiling.span('firestore.load_open_jobs', ward=ward):
+            jobs = work_queue.load_open_jobs(firebase.db, ward)
+        return jsonify(jobs), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/photos/<path:blob_name>')
+def serve_photo(blob_name):
+    """Redirects to a short-lived signed URL for a report photo."""
+    if not firebase.bucket:
+        return jsonify({"error": "Firebase is not configured."}), 500
+    if not blob_name.startswith(photos.PHOTO_PREFIX):
+        return jsonify({"error": "Photo not found"}), 404
+
+    try:
+        with profiling.span('gcs.signed_url', blob=blob_name):
+            url = photos.signed_url(firebase.bucket, blob_name)
+        return redirect(url)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/thumbnails/<path:blob_name>')
+def serve_thumbnail(blob_name):
+    """Serves a report photo thumbnail from the local cache (supports Range and conditional requests)."""
+    if not firebase.bucket:
+        return jsonify({"error": "Firebase is not configured."}), 500
+    if not blob_name.startswith(photos.PHOTO_PREFIX):
+        return jsonify({"error": "Photo not found"}), 404
+    thumbnail_cache = photos.thumbnail_cache()
+    if thumbnail_cache is None:
+        return redirect(url_for('citizen.serve_photo', blob_name=blob_name))
+
+    try:
+        for attempt in range(2):
+            with profiling.span('gcs.thumbnail', blob=blob_name):
+                path, mimetype = thumbnail_cache.get(firebase.bucket, blob_name)
+            try:
+                return send_file(path, mimetype=mimetype, conditional=True, etag=True, max_age=86400)
+            except FileNotFoundError:
+                # Evicted by a concurrent miss between get() and opening the file.
+                if attempt:
+                    raise
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/sla')
+def get_sla_metrics():
+    """Returns median Reported -> Completed time per issue type from the status event log."""
+    if not firebase.db:
+        return jsonify({"error": "Firebase is not configured."}), 500
+
+    try:
+        with profiling.span('firestore.sla_metrics'):
+            metrics = status_events.sla_metrics(firebase.db)
+        return jsonify(metrics), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/tiles/<int:z>/<int:x>/<int:y>')
+def get_density_tile(z, x, y):
+    """Returns a report-density heatmap tile (sparse grid counts) for web-mercator tile z/x/y."""
+    if not firebase.db:
+        return jsonify({"error": "Firebase is not configured."}), 500
+    if z > tiles.MAX_ZOOM or x >= 1 << z or y >= 1 << z:
+        return jsonify({"error": "Tile out of range"}), 404
+
+    try:
+        with profiling.span('tiles.tile', z=z):
+            tile = tiles.tile_index(firebase.db).tile(z, x, y)
+        response = jsonify(tile)
+        response.headers['Cache-Control'] = 'public, max-age=60'
+        return response, 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/vote', methods=['POST'])
+@bp.route('/api/engage', methods=['POST'])
+def engage():
+    """Records a vote ("+1") or view on an existing report via sharded counters."""
+    if not firebase.db:
+        return jsonify({"error": "Firebase is not configured."}), 500
+
+    data = request.json
+    report_id = data.get('id')
+    field = data.get('type', 'votes')
+
+    if not report_id:
+        return jsonify({"error": "Missing ID"}), 400
+    if field not in sharded_counter.COUNTER_FIELDS:
+        return jsonify({"error": "Invalid engagement type"}), 400
+
+    try:
+        doc_ref = firebase.db.collection('reports').document(report_id)
+        # Shards are subcollections, so writing them would not fail for a
+        # missing (or archived) report; check first to avoid orphan counters.
+        with profiling.span('firestore.get', doc=report_id):
+            exists = doc_ref.get(field_paths=['status']).exists
+        if not exists:
+            return jsonify({"error": "Report not found"}), 404
+        with profiling.span('firestore.increment', field=field):
+            sharded_counter.increment(doc_ref, field)
+        with profiling.span('firestore.get_counts'):
+            counts = sharded_counter.get_counts(doc_ref)
+        return jsonify(counts), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/api/engagement/<report_id>')
+def get_engagement(report_id):
+    """Returns the (cached) aggregated vote and view counts for a report."""
+    if not firebase.db:
+        return jsonify({"error": "Firebase is not configured."}), 500
+
+    try:
+        doc_ref = firebase.db.collection('reports').document(report_id)
+        with profiling.span('firestore.get_counts'):
+            counts = sharded_counter.get_counts(doc_ref)
+        return jsonify(counts), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
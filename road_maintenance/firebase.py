@@ -0,0 +1,62 @@
+import os
+
+import firebase_admin
+from firebase_admin import credentials, firestore, storage
+
+# --- Firebase Initialization ---
+# Credentials come from the FIREBASE_* environment variables when
+# FIREBASE_PRIVATE_KEY is set, otherwise from the service account key file at
+# SERVICE_ACCOUNT_KEY_PATH. Views read `firebase.db` / `firebase.bucket` at
+# request time; both stay None if initialization fails.
+
+SERVICE_ACCOUNT_KEY_PATH = os.environ.get(
+    "SERVICE_ACCOUNT_KEY_PATH", 'road-maintenance-feedback-firebase-adminsdk-fb5vc-a4fba31142.json')
+
+db = None
+bucket = None
+
+
+def _credentials():
+    if os.environ.get("FIREBASE_PRIVATE_KEY"):
+        return credentials.Certificate({
+            "type": "service_account",
+            "project_id": os.environ.get("FIREBASE_PROJECT_ID"),
+            "private_key_id": os.environ.get("FIREBASE_PRIVATE_KEY_ID"),
+            "private_key": os.environ.get("FIREBASE_PRIVATE_KEY").replace('\\n', '\n'),
+            "client_email": os.environ.get("FIREBASE_CLIENT_EMAIL"),
+            "client_id": os.environ.get("FIREBASE_CLIENT_ID"),
+            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+            "token_uri": "https://oauth2.googleapis.com/token",
+            "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+            "client_x509_cert_url": os.environ.get("FIREBASE_CLIENT_CERT_URL"),
+            "universe_domain": "googleapis.com"
+        })
+    return credentials.Certificate(SERVICE_ACCOUNT_KEY_PATH)
+
+
+def init():
+    """Initializes the Firebase Admin SDK once and returns (db, bucket)."""
+    global db, bucket
+    if db is not None:
+        return db, bucket
+
+    try:
+        try:
+            firebase_admin.get_app()
+        except ValueError:
+            options = {}
+            if os.environ.get("FIREBASE_STORAGE_BUCKET"):
+                options['storageBucket'] = os.environ["FIREBASE_STORAGE_BUCKET"]
+            firebase_admin.initialize_app(_credentials(), options)
+        db = firestore.client()
+        print("Firebase initialized successfully.")
+    except Exception as e:
+        print(f"Error initializing Firebase: {e}")
+        print("Warning: Firebase not initialized. API endpoints will not be functional.")
+        return None, None
+
+    try:
+        bucket = storage.bucket()
+    except Exception as e:
+        print(f"Warning: Cloud Storage not configured, photo uploads are disabled: {e}")
+    return db, bucket
@@ -0,0 +1,189 @@
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from flask import Response, jsonify, make_response, request
+
+from .reports import IDEMPOTENCY_KEY_PATTERN
+
+# --- Idempotent Requests ---
+# Mobile clients retry on timeouts. A mutating endpoint wrapped with
+# @idempotent() remembers the response it sent for each Idempotency-Key
+# header and replays it verbatim for any retry, without running the view (and
+# so without touching Firestore or Cloud Storage) again. Concurrent retries of
+# the same key wait for the first one to finish instead of racing it.
+#
+# Each stored response remembers a fingerprint of the request body. Reusing a
+# key with a different body is a client bug and gets a 422 instead of a
+# replay of an unrelated response.
+#
+# Responses are kept in a bounded in-memory LRU with a TTL. If a spill path is
+# configured, entries evicted from memory before they expire are written to a
+# SQLite file and still found there.
+
+IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", 24 * 60 * 60))
+IDEMPOTENCY_MAX_ENTRIES = int(os.environ.get("IDEMPOTENCY_MAX_ENTRIES", 10000))
+IDEMPOTENCY_SPILL_PATH = os.environ.get("IDEMPOTENCY_SPILL_PATH")
+
+
+class IdempotencyStore:
+    """Bounded, TTL-evicted map of idempotency key -> (fingerprint, status, body, mimetype)."""
+
+    def __init__(self, max_entries=IDEMPOTENCY_MAX_ENTRIES, ttl=IDEMPOTENCY_TTL, spill_path=IDEMPOTENCY_SPILL_PATH):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._spill = None
+        if spill_path:
+            self._spill = sqlite3.connect(spill_path, check_same_thread=False)
+            self._spill.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, expires_at REAL, status INTEGER, body BLOB, mimetype TEXT, "
+                "fingerprint TEXT)")
+            try:
+                # Spill files created before fingerprints were stored.
+                self._spill.execute("ALTER TABLE responses ADD COLUMN fingerprint TEXT")
+            except sqlite3.OperationalError:
+                pass
+            self._spill.commit()
+
+    def get(self, key):
+        """Returns the stored (fingerprint, status, body, mimetype) for `key`, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return entry[1:]
+                del self._entries[key]
+            if self._spill:
+                row = self._spill.execute(
+                    "SELECT fingerprint, status, body, mimetype FROM responses WHERE key = ? AND expires_at > ?",
+                    (key, now)).fetchone()
+                if row:
+                    return row[0], row[1], bytes(row[2]), row[3]
+        return None
+
+    def put(self, key, fingerprint, status, body, mimetype):
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, fingerprint, status, body, mimetype)
+            self._entries.move_to_end(key)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted_key, entry = self._entries.popitem(last=False)
+                if entry[0] > now:
+                    evicted.append((evicted_key,) + entry)
+            if self._spill and evicted:
+                self._spill.executemany(
+                    "INSERT OR REPLACE INTO responses (key, expires_at, fingerprint, status, body, mimetype) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    evicted)
+                self._spill.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+                self._spill.commit()
+
+    @contextmanager
+    def claim(self, key):
+        """Serializes requests carrying the same key while the first one is being handled."""
+        with self._lock:
+            entry = self._inflight.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+        try:
+            yield
+        finally:
+            entry[0].release()
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._inflight[key]
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def default_store():
+    """Returns the process-wide store configured from the IDEMPOTENCY_* environment variables."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = IdempotencyStore()
+        return _default_store
+
+
+def idempotency_key():
+    """Returns the request's Idempotency-Key header, or None if it is absent."""
+    return request.headers.get('Idempotency-Key') or None
+
+
+def request_fingerprint():
+    """Returns a hash of the request's content that ignores how it was encoded.
+
+    JSON bodies are hashed in canonical form and multipart/form bodies by
+    their fields and file contents, so a retry that re-encodes the same data
+    (e.g. with a new multipart boundary) still matches.
+    """
+    digest = hashlib.sha256()
+    if request.is_json:
+        digest.update(json.dumps(request.get_json(silent=True), sort_keys=True).encode('utf-8'))
+    elif request.form or request.files:
+        digest.update(json.dumps(sorted(request.form.items(multi=True))).encode('utf-8'))
+        for name, file in sorted(request.files.items(multi=True), key=lambda item: item[0]):
+            digest.update(name.encode('utf-8'))
+            for chunk in iter(lambda: file.stream.read(65536), b''):
+                digest.update(chunk)
+            file.stream.seek(0)
+    else:
+        digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def idempotent(store=None):
+    """Decorates a Flask view so requests with a repeated Idempotency-Key replay the first response.
+
+    Uses default_store() unless `store` is given. Server errors (5xx) are not
+    stored, and neither are 401/403, so a retry after a failure or after
+    logging in runs again. A repeated key with a
+    different request body is rejected with 422.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            responses = store or default_store()
+            key = idempotency_key()
+            if key is None:
+                return view(*args, **kwargs)
+            if not IDEMPOTENCY_KEY_PATTERN.match(key):
+                return jsonify({"error": "Malformed Idempotency-Key"}), 400
+
+            scoped_key = f"{request.path}:{key}"
+            fingerprint = request_fingerprint()
+            with responses.claim(scoped_key):
+                cached = responses.get(scoped_key)
+                if cached:
+                    stored_fingerprint, status, body, mimetype = cached
+                    # Entries spilled before fingerprints were stored have none.
+                    if stored_fingerprint is not None and stored_fingerprint != fingerprint:
+                        return jsonify({"error": "Idempotency-Key was already used with a different request"}), 422
+                    return Response(body, status=status, mimetype=mimetype,
+                                    headers={'Idempotent-Replayed': 'true'})
+
+                response = make_response(view(*args, **kwargs))
+                # Auth failures are not the outcome of the operation; after
+                # logging in, a retry with the same key must run the view.
+                if response.status_code < 500 and response.status_code not in (401, 403):
+                    responses.put(scoped_key, fingerprint, response.status_code, response.get_data(),
+                                  response.mimetype)
+                return response
+        return wrapper
+    return decorator
@@ -0,0 +1,135 @@
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from firebase_admin import firestore
+
+from . import work_queue
+from .models import LEGACY_FIELDS, SCHEMA_VERSION, Report
+
+# --- Legacy Report Migration ---
+# One-off job that rewrites every `reports` document not yet at
+# SCHEMA_VERSION into the current shape, deleting the legacy keys and
+# backfilling work-queue entries for open reports. Documents are read in
+# pages ordered by ID and written in batches on a thread pool, so the scan
+# keeps going while earlier batches commit.
+#
+# Each update carries a last-update-time precondition: if a report changed
+# after it was read, its batch fails and the affected documents are retried
+# one by one from a fresh read.
+#
+#     python -m road_maintenance.migrate [--dry-run]
+
+PAGE_SIZE = 500
+BATCH_SIZE = 200  # reports per batch; each may need two writes
+DEFAULT_WORKERS = 8
+
+
+def _migration_update(data):
+    report = Report.from_firestore(None, data)
+    if report.status_updated_at is None:
+        # Best available approximation for reports that predate the field.
+        report.status_updated_at = report.created_at or firestore.SERVER_TIMESTAMP
+    report.ward = work_queue.ward_for(report.to_firestore())
+    update = report.to_firestore()
+    for key in LEGACY_FIELDS:
+        if key in data:
+            update[key] = firestore.DELETE_FIELD
+    return update
+
+
+def _stage(db, writer, snapshot):
+    update = _migration_update(snapshot.to_dict())
+    writer.update(snapshot.reference, update,
+                  option=db.write_option(last_update_time=snapshot.update_time))
+    work_queue.enqueue(writer, db, snapshot.id, update)
+
+
+def _commit(db, snapshots):
+    """Commits one batch; on a precondition failure retries each document individually."""
+    batch = db.batch()
+    for snapshot in snapshots:
+        _stage(db, batch, snapshot)
+    try:
+        batch.commit()
+        return len(snapshots), 0
+    except Exception as e:
+        print(f"Batch of {len(snapshots)} failed ({e}); retrying individually.")
+
+    migrated = failed = 0
+    for snapshot in snapshots:
+        fresh = snapshot.reference.get()
+        if not fresh.exists or _is_current(fresh):
+            continue
+        batch = db.batch()
+        _stage(db, batch, fresh)
+        try:
+            batch.commit()
+            migrated += 1
+        except Exception as e:
+            print(f"Error migrating report {fresh.id}: {e}")
+            failed += 1
+    return migrated, failed
+
+
+def _is_current(snapshot):
+    return (snapshot.to_dict() or {}).get('schema_version') == SCHEMA_VERSION
+
+
+def migrate(db, workers=DEFAULT_WORKERS, dry_run=False):
+    """Migrates all legacy report documents. Returns (scanned, migrated, failed)."""
+    scanned = migrated = failed = 0
+    pending = set()
+    legacy = []
+
+    def collect(futures):
+        nonlocal migrated, failed
+        for future in futures:
+            ok, bad = future.result()
+            migrated += ok
+            failed += bad
+
+    def submit(chunk):
+        nonlocal migrated, pending
+        if dry_run:
+            migrated += len(chunk)
+            return
+        # Bound the number of in-flight batches so memory stays flat.
+        while len(pending) >= workers * 2:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+        pending.add(executor.submit(_commit, db, chunk))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        query = db.collection('reports').order_by('__name__').limit(PAGE_SIZE)
+        last = None
+        while True:
+            page = list((query.start_after(last) if last else query).stream())
+            if not page:
+                break
+            last = page[-1]
+            scanned += len(page)
+            legacy.extend(doc for doc in page if not _is_current(doc))
+            while len(legacy) >= BATCH_SIZE:
+                submit(legacy[:BATCH_SIZE])
+                legacy = legacy[BATCH_SIZE:]
+        if legacy:
+            submit(legacy)
+
+        done, pending = wait(pending)
+        collect(done)
+
+    return scanned, migrated, failed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rewrite legacy report documents into the current schema")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--dry-run', action='store_true', help="count legacy documents without writing")
+    args = parser.parse_args()
+
+    from . import firebase
+
+    db = firebase.init()[0]
+    scanned, migrated, failed = migrate(db, args.workers, args.dry_run)
+    verb = "Would migrate" if args.dry_run else "Migrated"
+    print(f"Scanned {scanned} reports. {verb} {migrated}; {failed} failed.")
@@ -0,0 +1,151 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# --- Report Model ---
+# The single schema for documents in the `reports` collection. Citizen input
+# is validated once, at ingest, by Report.from_submission(); everything that
+# reads reports back (dashboards, work queues, the event log, archival)
+# works from Report.from_firestore() or the dict produced by to_firestore().
+#
+# Documents written before this schema existed used camelCase keys
+# (issueType, photoURL, timestamp) or spreadsheet-style ones ('Issue Type',
+# 'Status'). from_firestore() still understands them so the app keeps working
+# until `python -m road_maintenance.migrate` has rewritten them.
+
+SCHEMA_VERSION = 2
+STATUSES = ('Reported', 'In Progress', 'Completed')
+ISSUE_TYPES = ('Pothole', 'Streetlight Out', 'Drainage Blockage', 'Damaged Guardrail', 'Other')
+MAX_TEXT_LENGTH = 2000
+MAX_WARD_LENGTH = 64
+
+_LEGACY_KEYS = {
+    'issue_type': ('issueType', 'Issue Type'),
+    'description': ('Description',),
+    'location': ('Location',),
+    'status': ('Status',),
+    'photo_path': ('photoPath',),
+    'photo_url': ('photoURL',),
+    'created_at': ('timestamp',),
+}
+LEGACY_FIELDS = tuple(key for keys in _LEGACY_KEYS.values() for key in keys) + ('ID',)
+
+
+class ValidationError(ValueError):
+    """Raised when a submission does not satisfy the report schema."""
+
+
+def validate_status(status):
+    """Returns `status` if it is a known report status, otherwise raises ValidationError."""
+    if status not in STATUSES:
+        raise ValidationError(f"Unknown status: {status}")
+    return status
+
+
+def parse_coordinates(source):
+    """Reads optional `lat`/`lng` values from a form or JSON mapping.
+
+    Returns a (lat, lng) tuple of floats, or (None, None) if either is missing
+    or out of range.
+    """
+    try:
+        lat = float(source.get('lat'))
+        lng = float(source.get('lng'))
+    except (TypeError, ValueError):
+        return None, None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None, None
+    return lat, lng
+
+
+def _required_text(fields, name):
+    value = fields.get(name)
+    if not isinstance(value, str) or not value.strip():
+        raise ValidationError(f"Missing {name}")
+    value = value.strip()
+    if len(value) > MAX_TEXT_LENGTH:
+        raise ValidationError(f"{name} is longer than {MAX_TEXT_LENGTH} characters")
+    return value
+
+
+@dataclass(slots=True)
+class Report:
+    issue_type: str
+    description: str
+    location: str
+    status: str = 'Reported'
+    ward: Optional[str] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    photo_path: Optional[str] = None
+    photo_url: Optional[str] = None  # public URL on reports uploaded before signed URLs
+    created_at: Any = None
+    status_updated_at: Any = None
+    reopened_at: Any = None  # when a Completed report last went back to an open status
+    id: Optional[str] = None  # the document ID; not stored in the document
+
+    @classmethod
+    def from_submission(cls, fields):
+        """Validates citizen-supplied form or JSON fields and builds a new report."""
+        issue_type = _required_text(fields, 'issue_type')
+        if issue_type not in ISSUE_TYPES:
+            raise ValidationError(f"Unknown issue type: {issue_type}")
+        ward = fields.get('ward')
+        ward = ward.strip()[:MAX_WARD_LENGTH] if isinstance(ward, str) and ward.strip() else None
+        lat, lng = parse_coordinates(fields)
+        return cls(
+            issue_type=issue_type,
+            description=_required_text(fields, 'description'),
+            location=_required_text(fields, 'location'),
+            ward=ward,
+            lat=lat,
+            lng=lng,
+        )
+
+    @classmethod
+    def from_firestore(cls, doc_id, data):
+        """Builds a report from a stored document, in the current or any legacy shape."""
+        if data.get('schema_version') != SCHEMA_VERSION:
+            data = dict(data)
+            for field, legacy_keys in _LEGACY_KEYS.items():
+                if data.get(field) is None:
+                    data[field] = next((data[key] for key in legacy_keys if data.get(key) is not None), None)
+        return cls(
+            issue_type=data.get('issue_type') or 'Other',
+            description=data.get('description') or '',
+            location=data.get('location') or '',
+            status=data.get('status') or 'Reported',
+            ward=data.get('ward'),
+            lat=data.get('lat'),
+            lng=data.get('lng'),
+            photo_path=data.get('photo_path'),
+            photo_url=data.get('photo_url'),
+            created_at=data.get('created_at'),
+            status_updated_at=data.get('status_updated_at'),
+            reopened_at=data.get('reopened_at'),
+            id=doc_id,
+        )
+
+    def to_firestore(self):
+        """Returns the document body for this report (without its ID)."""
+        return {
+            'schema_version': SCHEMA_VERSION,
+            'issue_type': self.issue_type,
+            'description': self.description,
+            'location': self.location,
+            'status': self.status,
+            'ward': self.ward,
+            'lat': self.lat,
+            'lng': self.lng,
+            'photo_path': self.photo_path,
+            'photo_url': self.photo_url,
+            'created_at': self.created_at,
+            'status_updated_at': self.status_updated_at,
+            'reopened_at': self.reopened_at,
+        }
+
+    def to_api(self):
+        """Returns the JSON-serializable shape served by the dashboard endpoints."""
+        data = self.to_firestore()
+        del data['schema_version']
+        data['id'] = self.id
+        return data
@@ -0,0 +1,247 @@
+import json
+
+# --- Offline-First Submission ---
+# Reports filed without connectivity are kept in an IndexedDB "outbox" (with
+# photos re-encoded to a small JPEG) and uploaded later, several at a time,
+# to a batch endpoint. Every queued report carries a client-generated
+# idempotency key that the server turns into the report's document ID, so a
+# batch that is retried after a dropped response never creates duplicates.
+#
+# The outbox code is shared by the page and the service worker: the page
+# flushes it when the browser comes back online, and the service worker
+# flushes it from a Background Sync event where that is supported.
+#
+# Reports the server rejects (e.g. failing validation) stay in the outbox,
+# marked as rejected with the server's error, and the page lists them until
+# the user dismisses them, so nothing queued offline disappears silently.
+
+OUTBOX_JS = """
+const OUTBOX_DB = 'citizen-watch-outbox';
+const OUTBOX_STORE = 'reports';
+const OUTBOX_BATCH_SIZE = 10;
+
+function openOutbox() {
+    return new Promise((resolve, reject) => {
+        const request = indexedDB.open(OUTBOX_DB, 1);
+        request.onupgradeneeded = () => request.result.createObjectStore(OUTBOX_STORE, { keyPath: 'key' });
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+function outboxRequest(mode, operation) {
+    return openOutbox().then(db => new Promise((resolve, reject) => {
+        const tx = db.transaction(OUTBOX_STORE, mode);
+        const request = operation(tx.objectStore(OUTBOX_STORE));
+        tx.oncomplete = () => { db.close(); resolve(request.result); };
+        tx.onerror = () => { db.close(); reject(tx.error); };
+    }));
+}
+
+const addToOutbox = (item) => outboxRequest('readwrite', store => store.put(item));
+const readOutbox = () => outboxRequest('readonly', store => store.getAll());
+const removeFromOutbox = (key) => outboxRequest('readwrite', store => store.delete(key));
+const markRejected = (item, error) => addToOutbox({ ...item, rejected: true, error });
+
+let outboxFlush = null;
+
+function flushOutbox() {
+    if (outboxFlush) {
+        return outboxFlush;
+    }
+    outboxFlush = (async () => {
+        const items = (await readOutbox()).filter(item => !item.rejected);
+        const byKey = new Map(items.map(item => [item.key, item]));
+        let sent = 0;
+        for (let i = 0; i < items.length; i += OUTBOX_BATCH_SIZE) {
+            const chunk = items.slice(i, i + OUTBOX_BATCH_SIZE);
+            const body = new FormData();
+            body.append('reports', JSON.stringify(chunk.map(item => ({ key: item.key, ...item.fields }))));
+            chunk.forEach(item => {
+                if (item.photo) {
+                    body.append(`photo_${item.key}`, item.photo, item.photoName);
+                }
+            });
+            const response = await fetch(OUTBOX_BATCH_URL, { method: 'POST', body });
+            if (!response.ok) {
+                throw new Error(`Batch upload failed with status ${response.status}`);
+            }
+            const result = await response.json();
+            for (const entry of result.results) {
+                if (entry.status === 'invalid') {
+                    // Retrying cannot help; keep the report so the user can see and fix it.
+                    if (byKey.has(entry.key)) {
+                        await markRejected(byKey.get(entry.key), entry.error || 'Rejected by the server');
+                    }
+                } else if (entry.status !== 'error') {
+                    // 'error' entries are transient server failures; keep them for the next flush.
+                    await removeFromOutbox(entry.key);
+                    sent++;
+                }
+            }
+        }
+        return sent;
+    })().finally(() => { outboxFlush = null; });
+    return outboxFlush;
+}
+"""
+
+SERVICE_WORKER_JS = """
+const SHELL_CACHE = 'citizen-watch-shell-v2';
+const SHELL_URLS = ['/', '/admin'];
+const SHELL_CDN_URLS = [
+    'https://cdn.tailwindcss.com',
+    'https://fonts.googleapis.com/css2?family=Inter:wght@400;500;700&display=swap'
+];
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(caches.open(SHELL_CACHE).then(cache => Promise.all([
+        cache.addAll(SHELL_URLS),
+        ...SHELL_CDN_URLS.map(url => fetch(url, { mode: 'no-cors' }).then(response => cache.put(url, response)).catch(() => {}))
+    ])).then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil(caches.keys().then(keys => Promise.all(
+        keys.filter(key => key !== SHELL_CACHE).map(key => caches.delete(key))
+    )).then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+    const path = new URL(request.url).pathname;
+    if (request.mode === 'navigate' && SHELL_URLS.includes(path)) {
+        // Network first so the page stays current; the cached shell is the offline fallback.
+        event.respondWith(fetch(request).then(response => {
+            const copy = response.clone();
+            caches.open(SHELL_CACHE).then(cache => cache.put(path, copy));
+            return response;
+        }).catch(() => caches.match(path)));
+    } else if (SHELL_CDN_URLS.includes(request.url)) {
+        event.respondWith(caches.match(request.url).then(cached => cached || fetch(request)));
+    }
+});
+
+self.addEventListener('sync', (event) => {
+    if (event.tag === 'outbox') {
+        // Let open pages refresh their list of rejected reports.
+        event.waitUntil(flushOutbox().finally(() => self.clients.matchAll().then(
+            clients => clients.forEach(client => client.postMessage('outbox-updated')))));
+    }
+});
+"""
+
+PAGE_JS = """
+function newIdempotencyKey() {
+    if (self.crypto && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 14)}`;
+}
+
+async function compressPhoto(file, maxDimension = 1280, quality = 0.7) {
+    if (!file || !file.size) {
+        return null;
+    }
+    try {
+        const bitmap = await createImageBitmap(file);
+        const scale = Math.min(1, maxDimension / Math.max(bitmap.width, bitmap.height));
+        const canvas = document.createElement('canvas');
+        canvas.width = Math.round(bitmap.width * scale);
+        canvas.height = Math.round(bitmap.height * scale);
+        canvas.getContext('2d').drawImage(bitmap, 0, 0, canvas.width, canvas.height);
+        return await new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', quality));
+    } catch (error) {
+        return file;
+    }
+}
+
+async function queueReport(fields, photoFile, key = newIdempotencyKey()) {
+    const photo = await compressPhoto(photoFile);
+    await addToOutbox({
+        key,
+        fields,
+        photo,
+        photoName: photo ? 'photo.jpg' : null,
+        queuedAt: Date.now()
+    });
+    if ('serviceWorker' in navigator) {
+        const registration = await navigator.serviceWorker.getRegistration();
+        if (registration && registration.sync) {
+            try {
+                await registration.sync.register('outbox');
+            } catch (error) {
+                console.warn('Background sync unavailable; will retry when back online.', error);
+            }
+        }
+    }
+}
+
+async function showRejectedReports() {
+    const rejected = (await readOutbox()).filter(item => item.rejected);
+    let panel = document.getElementById('outbox-rejected');
+    if (!rejected.length) {
+        if (panel) {
+            panel.remove();
+        }
+        return;
+    }
+    if (!panel) {
+        panel = document.createElement('div');
+        panel.id = 'outbox-rejected';
+        panel.className = 'fixed bottom-4 inset-x-4 max-w-xl mx-auto bg-red-50 border border-red-300 text-red-800 text-sm rounded-md shadow-lg p-4 space-y-2';
+        document.body.appendChild(panel);
+    }
+    panel.innerHTML = '<p class="font-bold">Some reports saved offline were not accepted. Please correct them and submit them again.</p>';
+    rejected.forEach(item => {
+        const row = document.createElement('div');
+        row.className = 'flex justify-between items-start space-x-2';
+        const text = document.createElement('span');
+        text.textContent = `${item.fields.issue_type || 'Report'} at ${item.fields.location || 'unknown location'}: ${item.error}`;
+        const dismiss = document.createElement('button');
+        dismiss.className = 'underline font-medium';
+        dismiss.textContent = 'Dismiss';
+        dismiss.addEventListener('click', async () => {
+            await removeFromOutbox(item.key);
+            await showRejectedReports();
+        });
+        row.append(text, dismiss);
+        panel.appendChild(row);
+    });
+}
+
+if ('serviceWorker' in navigator) {
+    navigator.serviceWorker.register('/sw.js').catch(error => console.warn('Service worker registration failed:', error));
+    navigator.serviceWorker.addEventListener('message', (event) => {
+        if (event.data === 'outbox-updated') {
+            showRejectedReports();
+        }
+    });
+}
+const flushQueuedReports = () => flushOutbox()
+    .catch(error => console.warn('Queued reports not sent yet:', error))
+    .finally(showRejectedReports);
+window.addEventListener('online', flushQueuedReports);
+if (navigator.onLine) {
+    flushQueuedReports();
+} else {
+    showRejectedReports();
+}
+"""
+
+
+def _batch_url_js(batch_url):
+    return f"const OUTBOX_BATCH_URL = {json.dumps(batch_url)};\n"
+
+
+def service_worker_js(batch_url):
+    """Returns the service worker source for an app whose batch endpoint is `batch_url`."""
+    return _batch_url_js(batch_url) + OUTBOX_JS + SERVICE_WORKER_JS
+
+
+def page_script(batch_url):
+    """Returns the <script> block that registers the service worker and exposes queueReport()."""
+    return f"<script>\n{_batch_url_js(batch_url)}{OUTBOX_JS}{PAGE_JS}</script>"
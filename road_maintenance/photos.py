@@ -0,0 +1,135 @@
+import hashlib
+import io
+import mimetypes
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it the cache stores originals.
+    Image = None
+
+# --- Photo Delivery ---
+# Citizen photos stay private in the bucket. Clients are redirected to
+# short-lived V4 signed URLs, which are cached and reused until they are close
+# to expiring so repeated dashboard loads do not re-sign every photo.
+
+PHOTO_PREFIX = 'reports/'
+PHOTO_CACHE_DIR = os.environ.get("PHOTO_CACHE_DIR")
+PHOTO_CACHE_MAX_BYTES = int(os.environ.get("PHOTO_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+SIGNED_URL_TTL = int(os.environ.get("SIGNED_URL_TTL_SECONDS", 900))
+SIGNED_URL_REFRESH_MARGIN = 120
+SIGNED_URL_CACHE_MAX_ENTRIES = int(os.environ.get("SIGNED_URL_CACHE_MAX_ENTRIES", 10000))
+THUMBNAIL_SIZE = (320, 320)
+
+# blob name -> (url, expires_at), least recently used first.
+_signed_urls = OrderedDict()
+_signed_urls_lock = threading.Lock()
+
+
+def signed_url(bucket, blob_name):
+    """Returns a signed GET URL for `blob_name`, reusing a cached one until near expiry."""
+    now = time.time()
+    with _signed_urls_lock:
+        cached = _signed_urls.get(blob_name)
+        if cached and cached[1] - now > SIGNED_URL_REFRESH_MARGIN:
+            _signed_urls.move_to_end(blob_name)
+            return cached[0]
+
+    url = bucket.blob(blob_name).generate_signed_url(
+        version='v4', expiration=timedelta(seconds=SIGNED_URL_TTL), method='GET')
+    with _signed_urls_lock:
+        _signed_urls[blob_name] = (url, now + SIGNED_URL_TTL)
+        _signed_urls.move_to_end(blob_name)
+        while len(_signed_urls) > SIGNED_URL_CACHE_MAX_ENTRIES:
+            _signed_urls.popitem(last=False)
+    return url
+
+
+class ThumbnailCache:
+    """On-disk LRU cache of photo thumbnails, bounded by total size in bytes.
+
+    Files are named by a hash of the blob name. Recency is tracked in memory
+    and mirrored in file modification times, which seed the order when the
+    cache is reopened.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._total = 0
+        os.makedirs(directory, exist_ok=True)
+        existing = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path) and not name.endswith('.tmp'):
+                stat = os.stat(path)
+                existing.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(existing):
+            self._entries[name] = size
+            self._total += size
+
+    def _filename(self, blob_name):
+        extension = '.jpg' if Image else os.path.splitext(blob_name)[1]
+        return hashlib.sha1(blob_name.encode('utf-8')).hexdigest() + extension
+
+    def get(self, bucket, blob_name):
+        """Returns (path, mimetype) of the cached thumbnail, fetching it from the bucket on a miss.
+
+        A concurrent miss may evict the file before the caller opens it; callers
+        should call get() again on FileNotFoundError.
+        """
+        name = self._filename(blob_name)
+        path = os.path.join(self.directory, name)
+        mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+        with self._lock:
+            if name in self._entries and os.path.exists(path):
+                self._entries.move_to_end(name)
+                os.utime(path)
+                return path, mimetype
+
+        data = bucket.blob(blob_name).download_as_bytes()
+        if Image:
+            image = Image.open(io.BytesIO(data))
+            image.thumbnail(THUMBNAIL_SIZE)
+            output = io.BytesIO()
+            image.convert('RGB').save(output, 'JPEG', quality=80)
+            data = output.getvalue()
+
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                evicted, size = self._entries.popitem(last=False)
+                self._total -= size
+                try:
+                    os.remove(os.path.join(self.directory, evicted))
+                except FileNotFoundError:
+                    pass
+        return path, mimetype
+
+
+_thumbnail_cache = None
+_thumbnail_cache_lock = threading.Lock()
+
+
+def thumbnail_cache():
+    """Returns the process-wide ThumbnailCache, or None if PHOTO_CACHE_DIR is not set."""
+    global _thumbnail_cache
+    if not PHOTO_CACHE_DIR:
+        return None
+    with _thumbnail_cache_lock:
+        if _thumbnail_cache is None:
+            _thumbnail_cache = ThumbnailCache(PHOTO_CACHE_DIR, PHOTO_CACHE_MAX_BYTES)
+        return _thumbnail_cache
@@ -0,0 +1,268 @@
+import cProfile
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request, session
+
+# --- Request Profiling ---
+# Opt-in profiling for tracking down slow requests. It is on for every
+# request when the app config has PROFILING set (PROFILING=1 in the
+# environment), and for a single request when a logged-in admin sends
+# `X-Profile: 1`.
+#
+# A profiled request runs under cProfile (one request at a time; cProfile
+# cannot nest) plus a stack sampler thread, and records span() timings
+# around Firestore / Cloud Storage calls. Requests slower than
+# PROFILE_THRESHOLD_MS, and every header-triggered request, are written
+# to PROFILE_DIR as
+#   <id>.prof       cProfile stats (pstats, snakeviz)
+#   <id>.collapsed  sampled stacks in py-spy's collapsed format
+#                   (flamegraph.pl, speedscope)
+#   <id>.json       request summary and span trace
+# The .json summaries on disk are the index of captures: /slow_requests is
+# built from them, so it survives restarts and shows every worker's captures
+# when PROFILE_DIR is shared. Only the PROFILE_MAX_REQUESTS most recent
+# captures are kept; older files are deleted after each capture and at startup.
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_THRESHOLD_MS = float(os.environ.get("PROFILE_THRESHOLD_MS", 1000))
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 1.0))
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get("PROFILE_SAMPLE_INTERVAL", 0.005))
+PROFILE_MAX_REQUESTS = int(os.environ.get("PROFILE_MAX_REQUESTS", 100))
+PROFILE_KINDS = ('prof', 'collapsed', 'json')
+
+_PROFILE_ID_PATTERN = re.compile(r'^\d{8}-\d{6}-[0-9a-f]{8}$')
+
+_cprofile_lock = threading.Lock()
+_prune_lock = threading.Lock()
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self._thread_id = thread_id
+        self._interval = interval
+        self._done = threading.Event()
+        self.stacks = Counter()
+
+    def run(self):
+        while not self._done.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[';'.join(reversed(names))] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+class RequestProfile:
+    """Profiling state for one request: cProfile, the stack sampler and recorded spans."""
+
+    def __init__(self, forced):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.forced = forced
+        self.spans = []
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms = None
+        self.profiler = None
+        if _cprofile_lock.acquire(blocking=False):
+            try:
+                profiler = cProfile.Profile()
+                profiler.enable()
+                self.profiler = profiler
+            except ValueError:  # another profiler (e.g. a debugger) is already active
+                _cprofile_lock.release()
+        self.sampler = _StackSampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL)
+        self.sampler.start()
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self._start) * 1000
+
+    def stop(self):
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = self.elapsed_ms()
+        if self.profiler is not None:
+            self.profiler.disable()
+            _cprofile_lock.release()
+        self.sampler.stop()
+
+    def save(self, directory, summary):
+        """Writes the profile files for this request and returns their paths by kind."""
+        directory = os.path.abspath(directory)
+        os.makedirs(directory, exist_ok=True)
+        paths = {kind: os.path.join(directory, f"{self.id}.{kind}") for kind in PROFILE_KINDS}
+        if self.profiler is not None:
+            self.profiler.dump_stats(paths['prof'])
+        else:
+            del paths['prof']
+        with open(paths['collapsed'], 'w') as f:
+            for stack, count in self.sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        # Written last and atomically: a listed summary implies its other files exist.
+        tmp_path = f"{paths['json']}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(dict(summary, spans=self.spans), f, indent=2)
+        os.replace(tmp_path, paths['json'])
+        return paths
+
+
+@contextmanager
+def span(name, **attrs):
+    """Times the enclosed block as a named span of the current request's profile, if any."""
+    profile = g.get('profile') if has_request_context() else None
+    if profile is None:
+        yield
+        return
+    start_ms = profile.elapsed_ms()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = repr(e)
+        raise
+    finally:
+        record = {"name": name, "start_ms": round(start_ms, 3),
+                  "duration_ms": round(profile.elapsed_ms() - start_ms, 3)}
+        if attrs:
+            record["attrs"] = attrs
+        if error:
+            record["error"] = error
+        profile.spans.append(record)
+
+
+def _wants_profile():
+    if request.headers.get(PROFILE_HEADER) == '1' and session.get('logged_in'):
+        return True, True
+    if current_app.config.get('PROFILING') and random.random() < PROFILE_SAMPLE_RATE:
+        return True, False
+    return False, False
+
+
+def _start_profile():
+    enabled, forced = _wants_profile()
+    if enabled:
+        g.profile = RequestProfile(forced)
+
+
+def _finish_profile(response):
+    profile = g.pop('profile', None)
+    if profile is None:
+        return response
+    profile.stop()
+    if not profile.forced and profile.duration_ms < PROFILE_THRESHOLD_MS:
+        return response
+
+    summary = {
+        "id": profile.id,
+        "method": request.method,
+        "path": request.full_path.rstrip('?'),
+        "endpoint": request.endpoint,
+        "status": response.status_code,
+        "duration_ms": round(profile.duration_ms, 3),
+        "started_at": profile.started_at,
+        "forced": profile.forced,
+        "cprofile": profile.profiler is not None,
+    }
+    directory = current_app.config.get('PROFILE_DIR', PROFILE_DIR)
+    try:
+        profile.save(directory, summary)
+        prune(directory)
+    except Exception as e:
+        print(f"Error saving request profile {profile.id}: {e}")
+        return response
+    response.headers['X-Profile-Id'] = profile.id
+    return response
+
+
+def _discard_profile(exc):
+    # after_request does not run when a view raises; make sure cProfile is released.
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profile.stop()
+
+
+def _summaries(directory):
+    """Returns (mtime, profile_id) of every capture summary in `directory`, newest first."""
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for name in os.listdir(directory):
+        profile_id, extension = os.path.splitext(name)
+        if extension == '.json' and _PROFILE_ID_PATTERN.match(profile_id):
+            try:
+                found.append((os.stat(os.path.join(directory, name)).st_mtime, profile_id))
+            except FileNotFoundError:
+                pass
+    return sorted(found, reverse=True)
+
+
+def prune(directory, keep=None):
+    """Deletes all but the `keep` (default PROFILE_MAX_REQUESTS) most recent captures, and files without a summary."""
+    keep = PROFILE_MAX_REQUESTS if keep is None else keep
+    with _prune_lock:
+        kept = {profile_id for _, profile_id in _summaries(directory)[:keep]}
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            profile_id, extension = os.path.splitext(name)
+            if extension.lstrip('.') not in PROFILE_KINDS or not _PROFILE_ID_PATTERN.match(profile_id):
+                continue  # in-progress .tmp files and anything not ours
+            if profile_id not in kept:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+def slow_requests(directory, limit=20):
+    """Returns the summaries of the captures kept in `directory`, slowest first."""
+    captures = []
+    for _, profile_id in _summaries(directory):
+        try:
+            with open(os.path.join(directory, f"{profile_id}.json")) as f:
+                capture = json.load(f)
+        except (OSError, ValueError):
+            continue  # pruned by another worker in the meantime
+        spans = capture.pop('spans', [])
+        capture['spans'] = len(spans)
+        capture['slowest_spans'] = sorted(spans, key=lambda s: -s['duration_ms'])[:5]
+        captures.append(capture)
+    captures.sort(key=lambda c: -c['duration_ms'])
+    return captures[:limit]
+
+
+def profile_path(directory, profile_id, kind):
+    """Returns the path of a kept capture file, or None if it does not exist."""
+    if kind not in PROFILE_KINDS or not _PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.abspath(os.path.join(directory, f"{profile_id}.{kind}"))
+    return path if os.path.isfile(path) else None
+
+
+def init_app(app):
+    """Registers the profiling hooks on `app`."""
+    app.config.setdefault('PROFILING', os.environ.get("PROFILING", "") == "1")
+    app.config.setdefault('PROFILE_DIR', PROFILE_DIR)
+    prune(app.config['PROFILE_DIR'])
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_discard_profile)
@@ -0,0 +1,86 @@
+import hashlib
+import re
+
+from firebase_admin import firestore
+
+from . import status_events, tiles, work_queue
+from .models import Report
+
+# --- Report Writes ---
+# Every path that creates a report or changes its status goes through here so
+# that derived documents (work queues, the status event log) are updated
+# atomically with the report.
+
+IDEMPOTENCY_KEY_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,128}$')
+
+
+def doc_ref_for_key(db, key):
+    """Returns the report DocumentReference derived from a client idempotency key.
+
+    The same key always maps to the same document, so a retried submission
+    collides with the original instead of creating a second report.
+    """
+    return db.collection('reports').document(hashlib.sha256(key.encode('utf-8')).hexdigest()[:20])
+
+
+def create_report(db, report, doc_ref=None):
+    """Stores a new Report and its work-queue entry in a single batch.
+
+    The report's `ward`, `id` and timestamps are filled in. Returns the new
+    report's DocumentReference. Raises google.api_core.exceptions.AlreadyExists
+    if `doc_ref` already exists.
+    """
+    if doc_ref is None:
+        doc_ref = db.collection('reports').document()
+    report.id = doc_ref.id
+    report.created_at = firestore.SERVER_TIMESTAMP
+    report.status_updated_at = firestore.SERVER_TIMESTAMP
+    report.ward = work_queue.ward_for(report.to_firestore())
+    report_data = report.to_firestore()
+
+    batch = db.batch()
+    batch.create(doc_ref, report_data)
+    work_queue.enqueue(batch, db, doc_ref.id, report_data)
+    status_events.append_event(batch, db, doc_ref, None, report.status, report_data)
+    batch.commit()
+    tiles.record_report(report.lat, report.lng)
+    return doc_ref
+
+
+@firestore.transactional
+def _apply_status(transaction, db, doc_ref, new_status):
+    snapshot = doc_ref.get(transaction=transaction)
+    if not snapshot.exists:
+        raise KeyError(f"Report {doc_ref.id} does not exist")
+    report = Report.from_firestore(doc_ref.id, snapshot.to_dict())
+    old_status = report.status
+    if old_status == new_status:
+        # Nothing to do; in particular status_updated_at, which archival
+        # selects on, must not move.
+        return
+    # Reports written before work queues existed have no stored ward.
+    report.ward = work_queue.ward_for(report.to_firestore())
+    report_data = report.to_firestore()
+
+    work_queue.dequeue(transaction, db, doc_ref.id, report_data)
+    status_events.append_event(transaction, db, doc_ref, old_status, new_status, report_data)
+    report_data['status'] = new_status
+    update = {
+        'status': new_status,
+        'ward': report.ward,
+        'status_updated_at': firestore.SERVER_TIMESTAMP
+    }
+    if old_status == status_events.RESOLVED_STATUS and new_status in status_events.OPEN_STATUSES:
+        # A reopened report's SLA clock restarts (see status_events.append_event).
+        update['reopened_at'] = firestore.SERVER_TIMESTAMP
+    transaction.update(doc_ref, update)
+    work_queue.enqueue(transaction, db, doc_ref.id, report_data)
+
+
+def update_report_status(db, report_id, new_status):
+    """Transactionally changes a report's status, moves its work-queue entry and logs the transition.
+
+    Setting a report to the status it already has is a no-op.
+    """
+    doc_ref = db.collection('reports').document(report_id)
+    _apply_status(db.transaction(), db, doc_ref, new_status)
@@ -0,0 +1,70 @@
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from firebase_admin import firestore
+
+# --- Sharded Counters ---
+# Firestore sustains roughly one write per second on a single document, so a
+# popular report receiving "+1" votes would throttle if every vote updated the
+# report itself. Each counter is instead spread over NUM_SHARDS sub-documents
+# (reports/{id}/shards/{n}); a write picks one shard at random and reads sum
+# across all of them.
+
+NUM_SHARDS = int(os.environ.get("COUNTER_SHARDS", 10))
+COUNTER_FIELDS = ('votes', 'views')
+COUNTER_CACHE_TTL = float(os.environ.get("COUNTER_CACHE_TTL", 30))
+COUNTER_CACHE_MAX_ENTRIES = int(os.environ.get("COUNTER_CACHE_MAX_ENTRIES", 10000))
+
+# doc path -> (totals, read_at), least recently used first.
+_count_cache = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def _shards(doc_ref):
+    return doc_ref.collection('shards')
+
+
+def increment(doc_ref, field, amount=1, num_shards=NUM_SHARDS):
+    """Adds `amount` to `field` on a randomly chosen shard of `doc_ref`."""
+    if field not in COUNTER_FIELDS:
+        raise ValueError(f"Unknown counter field: {field}")
+    shard_ref = _shards(doc_ref).document(str(random.randrange(num_shards)))
+    # merge=True creates the shard on first use, so counters need no setup step.
+    shard_ref.set({field: firestore.Increment(amount)}, merge=True)
+
+    # Reflect the write in the cached aggregate so the caller sees its own vote.
+    with _count_cache_lock:
+        cached = _count_cache.get(doc_ref.path)
+        if cached:
+            cached[0][field] += amount
+
+
+def read_counts(doc_ref):
+    """Sums every counter field across all shards of `doc_ref` (uncached)."""
+    totals = dict.fromkeys(COUNTER_FIELDS, 0)
+    for shard in _shards(doc_ref).stream():
+        data = shard.to_dict() or {}
+        for field in COUNTER_FIELDS:
+            totals[field] += data.get(field, 0)
+    return totals
+
+
+def get_counts(doc_ref, max_age=COUNTER_CACHE_TTL):
+    """Returns aggregated counts, re-reading the shards at most every `max_age` seconds."""
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(doc_ref.path)
+        if cached and now - cached[1] < max_age:
+            _count_cache.move_to_end(doc_ref.path)
+            return dict(cached[0])
+
+    totals = read_counts(doc_ref)
+    with _count_cache_lock:
+        _count_cache[doc_ref.path] = (totals, now)
+        _count_cache.move_to_end(doc_ref.path)
+        while len(_count_cache) > COUNTER_CACHE_MAX_ENTRIES:
+            _count_cache.popitem(last=False)
+    return dict(totals)
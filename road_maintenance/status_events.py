@@ -0,0 +1,215 @@
+import argparse
+import bisect
+import math
+import threading
+from collections import defaultdict
+from datetime import timedelta
+
+from firebase_admin import firestore
+
+# --- Status Event Log ---
+# Every status transition is appended to reports/{id}/events as an immutable
+# document in the same batch/transaction that changes the report (see
+# reports.py). Nothing ever updates or deletes an event except compaction,
+# which folds a report's already-aggregated events into a single
+# reports/{id}/events/_compacted document so the log stays small.
+#
+# SlaAggregator consumes the log incrementally: it remembers the timestamp of
+# the last event it folded in and only queries newer events on each refresh.
+# Its state lives in the metrics/sla checkpoint, which every refresh starts
+# from and writes back in one transaction, so several processes (and the
+# compaction job, which deletes events older than the checkpoint cursor)
+# never fold from a stale cursor. Each Completed event carries the time the
+# report was opened, so no per-report state is kept in the checkpoint.
+
+COMPACTED_DOC_ID = '_compacted'
+CHECKPOINT_PATH = ('metrics', 'sla')
+RESOLVED_STATUS = 'Completed'
+OPEN_STATUSES = ('Reported', 'In Progress')
+
+# Durations are kept in log-scaled histogram buckets (each ~10% wider than the
+# previous), which makes the median an O(buckets) lookup with bounded memory
+# and keeps the checkpoint small no matter how many reports are resolved.
+# The reported median is the midpoint of the bucket holding the true median,
+# so it is approximate (within about 5%).
+_BUCKET_BASE = 1.1
+
+
+def append_event(writer, db, doc_ref, from_status, to_status, report):
+    """Appends a transition event for `doc_ref` using `writer` (a WriteBatch or Transaction).
+
+    `report` is the report document as produced by Report.to_firestore().
+    """
+    writer.set(doc_ref.collection('events').document(), {
+        'report_id': doc_ref.id,
+        'from': from_status,
+        'to': to_status,
+        'issue_type': report.get('issue_type'),
+        'reported_at': report.get('created_at'),
+        # Start of the current open period: creation, or the last reopening.
+        'opened_at': report.get('reopened_at') or report.get('created_at'),
+        'at': firestore.SERVER_TIMESTAMP,
+    })
+
+
+def _bucket(minutes):
+    return int(math.log(max(minutes, 1.0), _BUCKET_BASE))
+
+
+def _bucket_midpoint(index):
+    return (_BUCKET_BASE ** index + _BUCKET_BASE ** (index + 1)) / 2
+
+
+class SlaAggregator:
+    """Incrementally computes Reported -> Completed times per issue type."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cursor = None
+        self.seen_at_cursor = set()
+        self.histograms = defaultdict(lambda: defaultdict(int))
+
+    def _fold(self, event):
+        if event.get('to') == RESOLVED_STATUS:
+            # Events logged before `opened_at` existed only have the report's creation time.
+            started = event.get('opened_at') or event.get('reported_at')
+            if started is not None:
+                minutes = (event['at'] - started).total_seconds() / 60
+                self.histograms[event.get('issue_type') or 'Other'][_bucket(minutes)] += 1
+
+    def refresh(self, db):
+        """Folds in every event appended since the last refresh."""
+        with self._lock:
+            query = db.collection_group('events')
+            if self.cursor is not None:
+                query = query.where('at', '>=', self.cursor)
+            for doc in query.order_by('at').stream():
+                event = doc.to_dict()
+                path = doc.reference.path
+                if path in self.seen_at_cursor:
+                    continue
+                self._fold(event)
+                if event['at'] != self.cursor:
+                    self.cursor = event['at']
+                    self.seen_at_cursor = set()
+                self.seen_at_cursor.add(path)
+
+    def metrics(self):
+        """Returns {issue_type: {"resolved": n, "median_hours": h}}; medians are bucket midpoints."""
+        with self._lock:
+            result = {}
+            for issue_type, histogram in self.histograms.items():
+                total = sum(histogram.values())
+                indexes = sorted(histogram)
+                cumulative = [0]
+                for index in indexes:
+                    cumulative.append(cumulative[-1] + histogram[index])
+                median_index = indexes[bisect.bisect_left(cumulative, total / 2, lo=1) - 1]
+                result[issue_type] = {
+                    'resolved': total,
+                    'median_hours': round(_bucket_midpoint(median_index) / 60, 2),
+                }
+            return result
+
+    def save(self, writer, checkpoint_ref):
+        """Writes the aggregator state to `checkpoint_ref` using `writer` (a Transaction)."""
+        with self._lock:
+            writer.set(checkpoint_ref, {
+                'cursor': self.cursor,
+                'seen_at_cursor': sorted(self.seen_at_cursor),
+                'histograms': {
+                    issue_type: {str(index): count for index, count in histogram.items()}
+                    for issue_type, histogram in self.histograms.items()
+                },
+            })
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Restores an aggregator from a checkpoint snapshot, or starts empty."""
+        aggregator = cls()
+        if snapshot.exists:
+            state = snapshot.to_dict()
+            aggregator.cursor = state.get('cursor')
+            aggregator.seen_at_cursor = set(state.get('seen_at_cursor', []))
+            for issue_type, histogram in state.get('histograms', {}).items():
+                for index, count in histogram.items():
+                    aggregator.histograms[issue_type][int(index)] = count
+        return aggregator
+
+
+def _checkpoint_ref(db):
+    return db.collection(CHECKPOINT_PATH[0]).document(CHECKPOINT_PATH[1])
+
+
+@firestore.transactional
+def _refresh_checkpoint(transaction, db):
+    checkpoint_ref = _checkpoint_ref(db)
+    aggregator = SlaAggregator.from_snapshot(checkpoint_ref.get(transaction=transaction))
+    cursor = aggregator.cursor
+    aggregator.refresh(db)
+    if aggregator.cursor != cursor:
+        aggregator.save(transaction, checkpoint_ref)
+    return aggregator
+
+
+def sla_metrics(db):
+    """Folds new events into the metrics/sla checkpoint and returns its metrics.
+
+    The checkpoint is re-read on every call and written back in the same
+    transaction, so a concurrent refresh in another process makes this one
+    retry instead of overwriting it.
+    """
+    return _refresh_checkpoint(db.transaction(), db).metrics()
+
+
+def compact(db, grace=timedelta(hours=1)):
+    """Folds events that the SLA checkpoint has already consumed into one document per report.
+
+    Only events older than the checkpoint cursor (minus `grace`) are touched, so
+    compaction never removes anything the aggregator has not yet seen.
+    Returns the number of event documents removed.
+    """
+    checkpoint = db.collection(CHECKPOINT_PATH[0]).document(CHECKPOINT_PATH[1]).get()
+    if not checkpoint.exists or checkpoint.to_dict().get('cursor') is None:
+        return 0
+    horizon = checkpoint.to_dict()['cursor'] - grace
+
+    by_report = defaultdict(list)
+    for doc in db.collection_group('events').where('at', '<', horizon).order_by('at').stream():
+        by_report[doc.get('report_id')].append(doc)
+
+    removed = 0
+    for report_id, docs in by_report.items():
+        events_ref = db.collection('reports').document(report_id).collection('events')
+        batch = db.batch()
+        transitions = []
+        for doc in docs:
+            event = doc.to_dict()
+            transitions.append({'from': event.get('from'), 'to': event.get('to'), 'at': event['at']})
+            batch.delete(doc.reference)
+        # The compacted document has no `at` field, so it is invisible to the
+        # aggregator's and compaction's ordered queries.
+        batch.set(events_ref.document(COMPACTED_DOC_ID), {
+            'report_id': report_id,
+            'transitions': firestore.ArrayUnion(transitions),
+        }, merge=True)
+        batch.commit()
+        removed += len(docs)
+    return removed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Status event log maintenance")
+    parser.add_argument('command', choices=['compact', 'metrics'])
+    parser.add_argument('--grace-hours', type=float, default=1.0)
+    args = parser.parse_args()
+
+    from . import firebase
+
+    db = firebase.init()[0]
+    if args.command == 'compact':
+        sla_metrics(db)
+        print(f"Compacted {compact(db, timedelta(hours=args.grace_hours))} events.")
+    else:
+        for issue_type, stats in sorted(sla_metrics(db).items()):
+            print(f"{issue_type}: {stats['resolved']} resolved, median {stats['median_hours']}h")
@@ -0,0 +1,806 @@
+# --- HTML Templates ---
+# CITIZEN_HTML is the public reporting page and dashboard served at "/";
+# ADMIN_HTML is the crew console (login, work queues, status updates) served
+# at "/admin". Both are rendered with `offline_script`, the outbox/service
+# worker <script> block from offline.page_script().
+
+CITIZEN_HTML = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Citizen Watch</title>
+    <script src="https://cdn.tailwindcss.com"></script>
+    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;700&display=swap" rel="stylesheet">
+    <style>
+        body { font-family: 'Inter', sans-serif; }
+    </style>
+</head>
+<body class="bg-gray-100 min-h-screen flex items-center justify-center p-4">
+
+    <div id="app-container" class="bg-white rounded-lg shadow-xl p-6 md:p-8 max-w-4xl w-full">
+        <h1 class="text-3xl md:text-4xl font-bold text-center text-gray-800 mb-2">
+            Citizen Watch
+        </h1>
+        <p class="text-center text-sm text-gray-500 mb-6">Transparent Road Maintenance System</p>
+
+        <!-- Tab Navigation -->
+        <div class="flex flex-col md:flex-row space-y-4 md:space-y-0 md:space-x-4 mb-6">
+            <button id="tab-report" class="flex-1 py-3 px-4 rounded-md font-medium transition-colors duration-200 focus:outline-none bg-blue-600 text-white shadow-lg hover:bg-blue-700">
+                Report Issue
+            </button>
+            <button id="tab-dashboard" class="flex-1 py-3 px-4 rounded-md font-medium transition-colors duration-200 focus:outline-none bg-gray-200 text-gray-800 hover:bg-gray-300">
+                Public Dashboard
+            </button>
+            <button id="tab-admin" class="flex-1 py-3 px-4 rounded-md font-medium transition-colors duration-200 focus:outline-none bg-gray-200 text-gray-800 hover:bg-gray-300">
+                Admin
+            </button>
+        </div>
+
+        <!-- Report Form View -->
+        <div id="report-view" class="view">
+            <form id="report-form" class="space-y-4">
+                <div>
+                    <label for="issue_type" class="block text-sm font-medium text-gray-700">Issue Type</label>
+                    <select id="issue_type" name="issue_type" required class="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring focus:ring-blue-500 focus:ring-opacity-50 transition-all duration-200 p-2">
+                        <option value="Pothole">Pothole</option>
+                        <option value="Streetlight Out">Streetlight Out</option>
+                        <option value="Drainage Blockage">Drainage Blockage</option>
+                        <option value="Damaged Guardrail">Damaged Guardrail</option>
+                        <option value="Other">Other</option>
+                    </select>
+                </div>
+                <div>
+                    <label for="description" class="block text-sm font-medium text-gray-700">Description</label>
+                    <textarea id="description" name="description" rows="4" required class="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring focus:ring-blue-500 focus:ring-opacity-50 transition-all duration-200 p-2"></textarea>
+                </div>
+                <div>
+                    <label for="location" class="block text-sm font-medium text-gray-700">Location</label>
+                    <input type="text" id="location" name="location" required class="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring focus:ring-blue-500 focus:ring-opacity-50 transition-all duration-200 p-2">
+                </div>
+                <div>
+                    <label for="ward" class="block text-sm font-medium text-gray-700">Ward (Optional)</label>
+                    <input type="text" id="ward" name="ward" class="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring focus:ring-blue-500 focus:ring-opacity-50 transition-all duration-200 p-2">
+                </div>
+                <div>
+                    <input type="hidden" id="lat" name="lat">
+                    <input type="hidden" id="lng" name="lng">
+                    <button type="button" id="use-location-btn" class="text-sm text-blue-600 hover:underline">Use my current location</button>
+                    <span id="location-status" class="ml-2 text-sm text-gray-500"></span>
+                </div>
+                <div>
+                    <label for="issue_photo" class="block text-sm font-medium text-gray-700">Attach Photo (Optional)</label>
+                    <input type="file" id="issue_photo" name="issue_photo" accept="image/*" class="mt-1 block w-full text-sm text-gray-500 file:mr-4 file:py-2 file:px-4 file:rounded-md file:border-0 file:text-sm file:font-semibold file:bg-blue-50 file:text-blue-700 hover:file:bg-blue-100"/>
+                </div>
+                <button type="submit" class="w-full bg-blue-600 text-white font-bold py-2 px-4 rounded-md shadow-lg hover:bg-blue-700 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-blue-500 transition-colors duration-200">
+                    Submit Report
+                </button>
+                <div id="report-message" class="mt-4 text-center text-sm font-medium hidden"></div>
+            </form>
+        </div>
+
+        <!-- Public Dashboard View -->
+        <div id="dashboard-view" class="view hidden">
+            <div class="overflow-x-auto rounded-md shadow-lg">
+                <table class="min-w-full divide-y divide-gray-200">
+                    <thead class="bg-gray-50">
+                        <tr>
+                            <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">ID</th>
+                            <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Issue</th>
+                            <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Location</th>
+                            <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Status</th>
+                            <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Photo</th>
+                        </tr>
+                    </thead>
+                    <tbody id="dashboard-body" class="bg-white divide-y divide-gray-200">
+                        <!-- Data will be populated by JavaScript -->
+                    </tbody>
+                </table>
+            </div>
+            <div class="mt-4 text-center text-sm text-gray-500">
+                <p>Status: 
+                    <span class="font-bold text-red-600">Reported</span>, 
+                    <span class="font-bold text-yellow-600">In Progress</span>, 
+                    <span class="font-bold text-green-600">Completed</span>
+                </p>
+            </div>
+        </div>
+        
+        <!-- Admin View -->
+        <div id="admin-view" class="view hidden">
+            <div class="space-y-4">
+                <div>
+                    <label for="issue_id_select" class="block text-sm font-medium text-gray-700">Select Issue ID</label>
+                    <select id="issue_id_select" class="mt-1 block w-full rounded-md border-gray-300 shadow-sm p-2"></select>
+                </div>
+                <div>
+                    <label for="status_select" class="block text-sm font-medium text-gray-700">Update Status to</label>
+                    <select id="status_select" class="mt-1 block w-full rounded-md border-gray-300 shadow-sm p-2">
+                        <option value="Reported">Reported</option>
+                        <option value="In Progress">In Progress</option>
+                        <option value="Completed">Completed</option>
+                    </select>
+                </div>
+                <button id="update-status-btn" class="w-full bg-blue-600 text-white font-bold py-2 px-4 rounded-md shadow-lg hover:bg-blue-700 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-blue-500 transition-colors duration-200">
+                    Update Status
+                </button>
+                <div id="admin-message" class="mt-4 text-center text-sm font-medium hidden"></div>
+            </div>
+        </div>
+    </div>
+    
+    <!-- Modal for Messages -->
+    <div id="modal-overlay" class="fixed inset-0 bg-gray-600 bg-opacity-50 hidden items-center justify-center p-4">
+        <div class="bg-white rounded-lg p-6 shadow-xl w-full max-w-sm text-center">
+            <h3 id="modal-title" class="text-xl font-bold mb-4 text-gray-800"></h3>
+            <p id="modal-message" class="text-gray-600 mb-6"></p>
+            <button id="modal-close-btn" class="w-full bg-blue-600 text-white font-bold py-2 px-4 rounded-md hover:bg-blue-700">
+                Close
+            </button>
+        </div>
+    </div>
+    {{ offline_script|safe }}
+    <script>
+        document.addEventListener('DOMContentLoaded', async () => {
+            const tabs = {
+                report: document.getElementById('tab-report'),
+                dashboard: document.getElementById('tab-dashboard'),
+                admin: document.getElementById('tab-admin'),
+            };
+            const views = {
+                report: document.getElementById('report-view'),
+                dashboard: document.getElementById('dashboard-view'),
+                admin: document.getElementById('admin-view'),
+            };
+            const reportForm = document.getElementById('report-form');
+            const dashboardBody = document.getElementById('dashboard-body');
+            const issueIdSelect = document.getElementById('issue_id_select');
+            const statusSelect = document.getElementById('status_select');
+            const updateStatusBtn = document.getElementById('update-status-btn');
+            const reportMessage = document.getElementById('report-message');
+            const adminMessage = document.getElementById('admin-message');
+            const modalOverlay = document.getElementById('modal-overlay');
+            const modalCloseBtn = document.getElementById('modal-close-btn');
+            const modalTitle = document.getElementById('modal-title');
+            const modalMessage = document.getElementById('modal-message');
+
+            const showTab = async (tabId) => {
+                Object.values(tabs).forEach(tab => {
+                    tab.classList.remove('bg-blue-600', 'text-white', 'shadow-lg');
+                    tab.classList.add('bg-gray-200', 'text-gray-800');
+                });
+                Object.values(views).forEach(view => view.classList.add('hidden'));
+
+                tabs[tabId].classList.remove('bg-gray-200', 'text-gray-800');
+                tabs[tabId].classList.add('bg-blue-600', 'text-white', 'shadow-lg');
+                views[tabId].classList.remove('hidden');
+
+                if (tabId === 'dashboard' || tabId === 'admin') {
+                    await fetchDashboardData();
+                }
+            };
+            showTab('report');
+            tabs.report.addEventListener('click', () => showTab('report'));
+            tabs.dashboard.addEventListener('click', () => showTab('dashboard'));
+            tabs.admin.addEventListener('click', () => showTab('admin'));
+            modalCloseBtn.addEventListener('click', () => modalOverlay.classList.add('hidden'));
+
+            document.getElementById('use-location-btn').addEventListener('click', () => {
+                const locationStatus = document.getElementById('location-status');
+                if (!navigator.geolocation) {
+                    locationStatus.textContent = 'Location is not available on this device.';
+                    return;
+                }
+                locationStatus.textContent = 'Locating...';
+                navigator.geolocation.getCurrentPosition((position) => {
+                    document.getElementById('lat').value = position.coords.latitude;
+                    document.getElementById('lng').value = position.coords.longitude;
+                    locationStatus.textContent = 'Location attached.';
+                }, () => {
+                    locationStatus.textContent = 'Could not get your location.';
+                });
+            });
+
+            reportForm.addEventListener('submit', async (e) => {
+                e.preventDefault();
+                reportMessage.textContent = 'Submitting...';
+                reportMessage.classList.remove('hidden', 'text-green-600', 'text-red-600');
+                reportMessage.classList.add('text-gray-600');
+                const formData = new FormData(reportForm);
+                const submissionKey = newIdempotencyKey();
+
+                const saveOffline = async () => {
+                    const fields = Object.fromEntries([...formData.entries()].filter(([name]) => name !== 'issue_photo'));
+                    await queueReport(fields, formData.get('issue_photo'), submissionKey);
+                    reportMessage.textContent = 'You are offline. Your report has been saved and will be sent automatically.';
+                    reportMessage.classList.remove('text-gray-600');
+                    reportMessage.classList.add('text-green-600');
+                    reportForm.reset();
+                };
+
+                try {
+                    if (!navigator.onLine) {
+                        await saveOffline();
+                        return;
+                    }
+                    const response = await fetch('/api/report', {
+                        method: 'POST',
+                        headers: { 'Idempotency-Key': submissionKey },
+                        body: formData
+                    });
+                    const result = await response.json();
+                    if (response.ok) {
+                        reportMessage.textContent = 'Report submitted successfully!';
+                        reportMessage.classList.remove('text-gray-600');
+                        reportMessage.classList.add('text-green-600');
+                        reportForm.reset();
+                    } else {
+                        throw new Error(result.error);
+                    }
+                } catch (error) {
+                    // fetch() rejects with a TypeError when the network is unreachable.
+                    if (error instanceof TypeError) {
+                        try {
+                            await saveOffline();
+                            return;
+                        } catch (queueError) {
+                            console.error('Error saving report offline:', queueError);
+                        }
+                    }
+                    console.error('Error submitting report:', error);
+                    reportMessage.textContent = 'Failed to submit report. Please try again.';
+                    reportMessage.classList.remove('text-gray-600');
+                    reportMessage.classList.add('text-red-600');
+                }
+            });
+
+            const fetchDashboardData = async () => {
+                try {
+                    const response = await fetch('/api/dashboard');
+                    const data = await response.json();
+                    renderDashboard(data);
+                    renderAdminPanel(data);
+                } catch (error) {
+                    console.error('Failed to fetch dashboard data:', error);
+                    modalTitle.textContent = 'Error';
+                    modalMessage.textContent = 'Could not load data from the server. Please ensure the Python server is running.';
+                    modalOverlay.classList.remove('hidden');
+                }
+            };
+
+            const renderDashboard = (reports) => {
+                dashboardBody.innerHTML = '';
+                reports.sort((a, b) => (Date.parse(b.created_at) || 0) - (Date.parse(a.created_at) || 0));
+                reports.forEach(report => {
+                    const statusColor = report.status === 'Reported' ? 'bg-red-100 text-red-800' :
+                                        report.status === 'In Progress' ? 'bg-yellow-100 text-yellow-800' :
+                                        'bg-green-100 text-green-800';
+                    const row = document.createElement('tr');
+                    row.innerHTML = `
+                        <td class="px-4 md:px-6 py-4 whitespace-nowrap text-sm font-medium text-gray-900">${report.id.substring(0, 6)}...</td>
+                        <td class="px-4 md:px-6 py-4 text-sm text-gray-900">${report.issue_type}</td>
+                        <td class="px-4 md:px-6 py-4 text-sm text-gray-900">${report.location}</td>
+                        <td class="px-4 md:px-6 py-4 whitespace-nowrap text-sm font-medium">
+                            <span class="px-2 inline-flex text-xs leading-5 font-semibold rounded-full ${statusColor}">
+                                ${report.status}
+                            </span>
+                        </td>
+                        <td class="px-4 md:px-6 py-4 text-sm text-gray-900">
+                            ${report.thumbnail_url ? `<a href="${report.photo_url}" target="_blank"><img src="${report.thumbnail_url}" alt="Photo" loading="lazy" class="h-12 w-12 object-cover rounded"></a>` :
+                              report.photo_url ? `<a href="${report.photo_url}" target="_blank" class="text-blue-500 hover:underline">View Photo</a>` : 'No Photo'}
+                        </td>
+                    `;
+                    dashboardBody.appendChild(row);
+                });
+            };
+
+            const renderAdminPanel = (reports) => {
+                issueIdSelect.innerHTML = '';
+                reports.sort((a, b) => (Date.parse(b.created_at) || 0) - (Date.parse(a.created_at) || 0));
+                if (reports.length > 0) {
+                    reports.forEach(report => {
+                        const option = document.createElement('option');
+                        option.value = report.id;
+                        option.textContent = `ID: ${report.id.substring(0, 6)}... - ${report.issue_type} (${report.location})`;
+                        issueIdSelect.appendChild(option);
+                    });
+                } else {
+                    const option = document.createElement('option');
+                    option.textContent = 'No issues to update';
+                    issueIdSelect.appendChild(option);
+                }
+            };
+
+            updateStatusBtn.addEventListener('click', async () => {
+                const issueId = issueIdSelect.value;
+                const newStatus = statusSelect.value;
+                if (!issueId) {
+                    adminMessage.textContent = 'No issues to update.';
+                    adminMessage.classList.remove('hidden', 'text-green-600');
+                    adminMessage.classList.add('text-red-600');
+                    return;
+                }
+
+                adminMessage.textContent = 'Updating...';
+                adminMessage.classList.remove('hidden', 'text-green-600', 'text-red-600');
+                adminMessage.classList.add('text-gray-600');
+
+                try {
+                    const response = await fetch('/api/update-status', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json', 'Idempotency-Key': newIdempotencyKey() },
+                        body: JSON.stringify({ id: issueId, status: newStatus })
+                    });
+                    const result = await response.json();
+                    if (response.status === 403) {
+                        adminMessage.innerHTML = 'Please <a href="/admin" class="underline">log in to the admin console</a> first.';
+                        adminMessage.classList.remove('text-gray-600');
+                        adminMessage.classList.add('text-red-600');
+                        return;
+                    }
+                    if (response.ok) {
+                        adminMessage.textContent = 'Status updated successfully!';
+                        adminMessage.classList.remove('text-gray-600');
+                        adminMessage.classList.add('text-green-600');
+                    } else {
+                        throw new Error(result.error);
+                    }
+                } catch (error) {
+                    console.error("Error updating document:", error);
+                    adminMessage.textContent = 'Failed to update status.';
+                    adminMessage.classList.remove('text-gray-600');
+                    adminMessage.classList.add('text-red-600');
+                }
+            });
+        });
+    </script>
+</body>
+</html>
+"""
+
+ADMIN_HTML = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Road Maintenance System</title>
+    <script src="https://cdn.tailwindcss.com"></script>
+    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;700&display=swap" rel="stylesheet">
+    <style>
+        body { font-family: 'Inter', sans-serif; }
+    </style>
+</head>
+<body class="bg-gray-100 min-h-screen flex items-center justify-center p-4">
+
+    <div id="app-container" class="bg-white rounded-lg shadow-xl p-6 md:p-8 max-w-4xl w-full">
+        <h1 class="text-3xl md:text-4xl font-bold text-center text-gray-800 mb-2">
+            Road Maintenance System
+        </h1>
+        <p class="text-center text-sm text-gray-500 mb-6">A unified reporting and admin app</p>
+
+        <!-- Tab Navigation -->
+        <div class="flex flex-col md:flex-row space-y-4 md:space-y-0 md:space-x-4 mb-6">
+            <button id="tab-report" class="flex-1 py-3 px-4 rounded-md font-medium transition-colors duration-200 focus:outline-none bg-blue-600 text-white shadow-lg hover:bg-blue-700">
+                Report an Issue
+            </button>
+            <button id="tab-dashboard" class="flex-1 py-3 px-4 rounded-md font-medium transition-colors duration-200 focus:outline-none bg-gray-200 text-gray-800 hover:bg-gray-300">
+                Public Dashboard
+            </button>
+            <button id="tab-admin" class="flex-1 py-3 px-4 rounded-md font-medium transition-colors duration-200 focus:outline-none bg-gray-200 text-gray-800 hover:bg-gray-300">
+                Admin
+            </button>
+        </div>
+
+        <!-- View Containers -->
+        <div id="report-view" class="view">
+            <form id="report-form" class="space-y-4">
+                <div>
+                    <label for="issue_type" class="block text-sm font-medium text-gray-700">Issue Type</label>
+                    <select id="issue_type" name="issue_type" required class="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring focus:ring-blue-500 focus:ring-opacity-50 transition-all duration-200 p-2">
+                        <option value="Pothole">Pothole</option>
+                        <option value="Streetlight Out">Streetlight Out</option>
+                        <option value="Drainage Blockage">Drainage Blockage</option>
+                        <option value="Damaged Guardrail">Damaged Guardrail</option>
+                        <option value="Other">Other</option>
+                    </select>
+                </div>
+                <div>
+                    <label for="description" class="block text-sm font-medium text-gray-700">Description</label>
+                    <textarea id="description" name="description" rows="4" required class="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring focus:ring-blue-500 focus:ring-opacity-50 transition-all duration-200 p-2"></textarea>
+                </div>
+                <div>
+                    <label for="location" class="block text-sm font-medium text-gray-700">Location</label>
+                    <input type="text" id="location" name="location" required class="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring focus:ring-blue-500 focus:ring-opacity-50 transition-all duration-200 p-2">
+                </div>
+                <div>
+                    <label for="ward" class="block text-sm font-medium text-gray-700">Ward (Optional)</label>
+                    <input type="text" id="ward" name="ward" class="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring focus:ring-blue-500 focus:ring-opacity-50 transition-all duration-200 p-2">
+                </div>
+                <div>
+                    <input type="hidden" id="lat" name="lat">
+                    <input type="hidden" id="lng" name="lng">
+                    <button type="button" id="use-location-btn" class="text-sm text-blue-600 hover:underline">Use my current location</button>
+                    <span id="location-status" class="ml-2 text-sm text-gray-500"></span>
+                </div>
+                <button type="submit" class="w-full bg-blue-600 text-white font-bold py-2 px-4 rounded-md shadow-lg hover:bg-blue-700 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-blue-500 transition-colors duration-200">
+                    Submit Report
+                </button>
+                <div id="report-message" class="mt-4 text-center text-sm font-medium hidden"></div>
+            </form>
+        </div>
+
+        <div id="dashboard-view" class="view hidden">
+            <div class="overflow-x-auto rounded-md shadow-lg">
+                <table class="min-w-full divide-y divide-gray-200">
+                    <thead class="bg-gray-50">
+                        <tr>
+                            <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">ID</th>
+                            <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Issue</th>
+                            <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Location</th>
+                            <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Status</th>
+                        </tr>
+                    </thead>
+                    <tbody id="dashboard-body" class="bg-white divide-y divide-gray-200">
+                        <!-- Data will be populated by JavaScript -->
+                    </tbody>
+                </table>
+            </div>
+        </div>
+        
+        <div id="admin-view" class="view hidden">
+            <div id="admin-login" class="space-y-4">
+                <h2 class="text-xl font-bold text-center">Admin Login</h2>
+                <form id="login-form" class="space-y-4">
+                    <div>
+                        <label for="username" class="block text-sm font-medium text-gray-700">Username</label>
+                        <input type="text" id="username" name="username" required class="mt-1 block w-full rounded-md border-gray-300 shadow-sm p-2">
+                    </div>
+                    <div>
+                        <label for="password" class="block text-sm font-medium text-gray-700">Password</label>
+                        <input type="password" id="password" name="password" required class="mt-1 block w-full rounded-md border-gray-300 shadow-sm p-2">
+                    </div>
+                    <button type="submit" class="w-full bg-blue-600 text-white font-bold py-2 px-4 rounded-md shadow-lg hover:bg-blue-700">
+                        Log In
+                    </button>
+                    <div id="login-message" class="mt-2 text-center text-sm font-medium hidden"></div>
+                </form>
+            </div>
+
+            <div id="admin-panel" class="space-y-4 hidden">
+                <form id="work-queue-form" class="flex space-x-2">
+                    <input type="text" id="work-queue-ward" placeholder="Ward or geohash (blank for all reports)" class="flex-1 rounded-md border-gray-300 shadow-sm p-2">
+                    <button type="submit" class="bg-blue-600 text-white font-bold py-2 px-4 rounded-md shadow-lg hover:bg-blue-700">
+                        My Open Jobs
+                    </button>
+                </form>
+                <div class="space-y-4">
+                    <div class="overflow-x-auto rounded-md shadow-lg">
+                        <table class="min-w-full divide-y divide-gray-200">
+                            <thead class="bg-gray-50">
+                                <tr>
+                                    <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">ID</th>
+                                    <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Issue</th>
+                                    <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Location</th>
+                                    <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Status</th>
+                                    <th class="px-4 md:px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Action</th>
+                                </tr>
+                            </thead>
+                            <tbody id="admin-body" class="bg-white divide-y divide-gray-200">
+                                <!-- Data will be populated by JavaScript -->
+                            </tbody>
+                        </table>
+                    </div>
+                </div>
+            </div>
+        </div>
+    </div>
+    
+    <!-- Modal for Messages -->
+    <div id="modal-overlay" class="fixed inset-0 bg-gray-600 bg-opacity-50 hidden items-center justify-center p-4">
+        <div class="bg-white rounded-lg p-6 shadow-xl w-full max-w-sm text-center">
+            <h3 id="modal-title" class="text-xl font-bold mb-4 text-gray-800"></h3>
+            <p id="modal-message" class="text-gray-600 mb-6"></p>
+            <button id="modal-close-btn" class="w-full bg-blue-600 text-white font-bold py-2 px-4 rounded-md hover:bg-blue-700">
+                Close
+            </button>
+        </div>
+    </div>
+    {{ offline_script|safe }}
+    <script>
+        document.addEventListener('DOMContentLoaded', async () => {
+            const tabs = {
+                report: document.getElementById('tab-report'),
+                dashboard: document.getElementById('tab-dashboard'),
+                admin: document.getElementById('tab-admin'),
+            };
+            const views = {
+                report: document.getElementById('report-view'),
+                dashboard: document.getElementById('dashboard-view'),
+                admin: document.getElementById('admin-view'),
+            };
+            const reportForm = document.getElementById('report-form');
+            const dashboardBody = document.getElementById('dashboard-body');
+            const adminBody = document.getElementById('admin-body');
+            const reportMessage = document.getElementById('report-message');
+            const loginForm = document.getElementById('login-form');
+            const loginMessage = document.getElementById('login-message');
+            const adminLogin = document.getElementById('admin-login');
+            const adminPanel = document.getElementById('admin-panel');
+            const modalOverlay = document.getElementById('modal-overlay');
+            const modalCloseBtn = document.getElementById('modal-close-btn');
+            const modalTitle = document.getElementById('modal-title');
+            const modalMessage = document.getElementById('modal-message');
+
+            const showTab = async (tabId) => {
+                Object.values(tabs).forEach(tab => {
+                    tab.classList.remove('bg-blue-600', 'text-white', 'shadow-lg');
+                    tab.classList.add('bg-gray-200', 'text-gray-800');
+                });
+                Object.values(views).forEach(view => view.classList.add('hidden'));
+
+                tabs[tabId].classList.remove('bg-gray-200', 'text-gray-800');
+                tabs[tabId].classList.add('bg-blue-600', 'text-white', 'shadow-lg');
+                views[tabId].classList.remove('hidden');
+
+                if (tabId === 'dashboard') {
+                    await fetchDashboardData();
+                } else if (tabId === 'admin' && !adminPanel.classList.contains('hidden')) {
+                    await refreshAdminPanel();
+                }
+            };
+            
+            showTab('report');
+            tabs.report.addEventListener('click', () => showTab('report'));
+            tabs.dashboard.addEventListener('click', () => showTab('dashboard'));
+            tabs.admin.addEventListener('click', () => showTab('admin'));
+            modalCloseBtn.addEventListener('click', () => modalOverlay.classList.add('hidden'));
+
+            function showModal(title, message) {
+                modalTitle.textContent = title;
+                modalMessage.textContent = message;
+                modalOverlay.classList.remove('hidden');
+                modalOverlay.classList.add('flex');
+            }
+
+            reportForm.addEventListener('submit', async (e) => {
+                e.preventDefault();
+                reportMessage.textContent = 'Submitting...';
+                reportMessage.classList.remove('hidden', 'text-green-600', 'text-red-600');
+                reportMessage.classList.add('text-gray-600');
+                
+                const formData = new FormData(reportForm);
+                const data = Object.fromEntries(formData.entries());
+                const submissionKey = newIdempotencyKey();
+
+                const saveOffline = async () => {
+                    await queueReport(data, null, submissionKey);
+                    reportMessage.textContent = 'You are offline. Your report has been saved and will be sent automatically.';
+                    reportMessage.classList.remove('text-gray-600');
+                    reportMessage.classList.add('text-green-600');
+                    reportForm.reset();
+                };
+
+                try {
+                    if (!navigator.onLine) {
+                        await saveOffline();
+                        return;
+                    }
+                    const response = await fetch('/report', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json', 'Idempotency-Key': submissionKey },
+                        body: JSON.stringify(data)
+                    });
+                    const result = await response.json();
+                    if (response.ok) {
+                        reportMessage.textContent = 'Report submitted successfully!';
+                        reportMessage.classList.remove('text-gray-600');
+                        reportMessage.classList.add('text-green-600');
+                        reportForm.reset();
+                    } else {
+                        throw new Error(result.error);
+                    }
+                } catch (error) {
+                    // fetch() rejects with a TypeError when the network is unreachable.
+                    if (error instanceof TypeError) {
+                        try {
+                            await saveOffline();
+                            return;
+                        } catch (queueError) {
+                            console.error('Error saving report offline:', queueError);
+                        }
+                    }
+                    console.error('Error submitting report:', error);
+                    reportMessage.textContent = 'Failed to submit report. Please try again.';
+                    reportMessage.classList.remove('text-gray-600');
+                    reportMessage.classList.add('text-red-600');
+                }
+            });
+
+            document.getElementById('use-location-btn').addEventListener('click', () => {
+                const locationStatus = document.getElementById('location-status');
+                if (!navigator.geolocation) {
+                    locationStatus.textContent = 'Location is not available on this device.';
+                    return;
+                }
+                locationStatus.textContent = 'Locating...';
+                navigator.geolocation.getCurrentPosition((position) => {
+                    document.getElementById('lat').value = position.coords.latitude;
+                    document.getElementById('lng').value = position.coords.longitude;
+                    locationStatus.textContent = 'Location attached.';
+                }, () => {
+                    locationStatus.textContent = 'Could not get your location.';
+                });
+            });
+
+            let workQueueWard = '';
+
+            const fetchReports = async () => {
+                try {
+                    const response = await fetch('/dashboard_data');
+                    return await response.json();
+                } catch (error) {
+                    console.error('Failed to fetch dashboard data:', error);
+                    showModal('Error', 'Could not load data from the server.');
+                    return null;
+                }
+            };
+
+            const fetchDashboardData = async () => {
+                const data = await fetchReports();
+                if (data) {
+                    renderDashboard(data);
+                }
+            };
+
+            // With a ward selected only that ward's work queue is read; the
+            // full report list is fetched only when no ward is given.
+            const refreshAdminPanel = async () => {
+                if (workQueueWard) {
+                    await fetchWorkQueue();
+                    return;
+                }
+                const data = await fetchReports();
+                if (data) {
+                    renderAdminPanel(data);
+                }
+            };
+
+            const fetchWorkQueue = async () => {
+                try {
+                    const response = await fetch(`/work_queue?ward=${encodeURIComponent(workQueueWard)}`);
+                    const data = await response.json();
+                    if (!response.ok) {
+                        throw new Error(data.error);
+                    }
+                    renderAdminPanel(data);
+                } catch (error) {
+                    console.error('Failed to fetch work queue:', error);
+                    showModal('Error', 'Could not load open jobs.');
+                }
+            };
+
+            document.getElementById('work-queue-form').addEventListener('submit', async (e) => {
+                e.preventDefault();
+                workQueueWard = document.getElementById('work-queue-ward').value.trim();
+                await refreshAdminPanel();
+            });
+
+            const renderDashboard = (reports) => {
+                dashboardBody.innerHTML = '';
+                reports.sort((a, b) => (Date.parse(b.created_at) || 0) - (Date.parse(a.created_at) || 0));
+                reports.forEach(report => {
+                    const row = document.createElement('tr');
+                    row.innerHTML = `
+                        <td class="px-4 md:px-6 py-4 whitespace-nowrap text-sm font-medium text-gray-900">${report.id}</td>
+                        <td class="px-4 md:px-6 py-4 text-sm text-gray-900">${report.issue_type}</td>
+                        <td class="px-4 md:px-6 py-4 text-sm text-gray-900">${report.location}</td>
+                        <td class="px-4 md:px-6 py-4 whitespace-nowrap text-sm font-medium">
+                            <span class="px-2 inline-flex text-xs leading-5 font-semibold rounded-full ${getStatusColor(report.status)}">
+                                ${report.status}
+                            </span>
+                        </td>
+                    `;
+                    dashboardBody.appendChild(row);
+                });
+            };
+
+            const renderAdminPanel = (reports) => {
+                adminBody.innerHTML = '';
+                reports.sort((a, b) => (Date.parse(b.created_at) || 0) - (Date.parse(a.created_at) || 0));
+                reports.forEach(report => {
+                    const row = document.createElement('tr');
+                    row.innerHTML = `
+                        <td class="px-4 md:px-6 py-4 whitespace-nowrap text-sm font-medium text-gray-900">${report.id}</td>
+                        <td class="px-4 md:px-6 py-4 text-sm text-gray-900">${report.issue_type}</td>
+                        <td class="px-4 md:px-6 py-4 text-sm text-gray-900">${report.location}</td>
+                        <td class="px-4 md:px-6 py-4 whitespace-nowrap text-sm font-medium">
+                            <select id="status-select-${report.id}" class="p-1 rounded-md">
+                                <option value="Reported" ${report.status === 'Reported' ? 'selected' : ''}>Reported</option>
+                                <option value="In Progress" ${report.status === 'In Progress' ? 'selected' : ''}>In Progress</option>
+                                <option value="Completed" ${report.status === 'Completed' ? 'selected' : ''}>Completed</option>
+                            </select>
+                        </td>
+                        <td class="px-4 md:px-6 py-4 whitespace-nowrap text-right text-sm font-medium">
+                            <button data-id="${report.id}" class="update-btn text-indigo-600 hover:text-indigo-900">Update</button>
+                        </td>
+                    `;
+                    adminBody.appendChild(row);
+                });
+
+                document.querySelectorAll('.update-btn').forEach(button => {
+                    button.addEventListener('click', async (e) => {
+                        const id = e.target.dataset.id;
+                        const newStatus = document.getElementById(`status-select-${id}`).value;
+                        await updateStatus(id, newStatus);
+                    });
+                });
+            };
+
+            const getStatusColor = (status) => {
+                switch (status) {
+                    case 'Reported': return 'bg-red-100 text-red-800';
+                    case 'In Progress': return 'bg-yellow-100 text-yellow-800';
+                    case 'Completed': return 'bg-green-100 text-green-800';
+                    default: return 'bg-gray-100 text-gray-800';
+                }
+            };
+
+            const updateStatus = async (id, newStatus) => {
+                try {
+                    const response = await fetch('/update_status', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json', 'Idempotency-Key': newIdempotencyKey() },
+                        body: JSON.stringify({ id: id, status: newStatus })
+                    });
+                    const result = await response.json();
+                    if (response.ok) {
+                        showModal('Success', 'Status updated successfully!');
+                        await refreshAdminPanel();
+                    } else {
+                        throw new Error(result.error);
+                    }
+                } catch (error) {
+                    console.error("Error updating status:", error);
+                    showModal('Error', 'Failed to update status.');
+                }
+            };
+
+            loginForm.addEventListener('submit', async (e) => {
+                e.preventDefault();
+                const username = loginForm.username.value;
+                const password = loginForm.password.value;
+                
+                loginMessage.textContent = 'Logging in...';
+                loginMessage.classList.remove('hidden');
+                loginMessage.classList.add('text-gray-600');
+
+                try {
+                    const response = await fetch('/login', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({ username, password })
+                    });
+                    const result = await response.json();
+                    if (response.ok) {
+                        adminLogin.classList.add('hidden');
+                        adminPanel.classList.remove('hidden');
+                        loginMessage.textContent = 'Login successful!';
+                        loginMessage.classList.remove('text-red-600', 'text-gray-600');
+                        loginMessage.classList.add('text-green-600');
+                        await refreshAdminPanel();
+                    } else {
+                        throw new Error(result.error);
+                    }
+                } catch (error) {
+                    console.error("Login failed:", error);
+                    showModal('Login Failed', 'Invalid username or password.');
+                    loginMessage.textContent = '';
+                }
+            });
+        });
+    </script>
+</body>
+</html>
+"""
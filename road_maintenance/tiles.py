@@ -0,0 +1,157 @@
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+# --- Density Tiles ---
+# Heatmap tiles for /api/tiles/{z}/{x}/{y}, in the usual web-mercator XYZ
+# scheme. Each tile is a TILE_GRID x TILE_GRID grid of report counts, sent
+# sparsely as [column, row, count] triples, so a viewport of a dozen tiles is
+# a few KB no matter how many reports it covers.
+#
+# Report coordinates are loaded once (lat/lng only) into NumPy arrays and
+# kept as normalized mercator x/y. The first request at a zoom level bins
+# every point for that level in one vectorized pass; new reports are appended
+# in place and only mark their own tile at each cached level as stale.
+# The index is reloaded every TILE_INDEX_TTL seconds to pick up reports
+# written by other processes and drop archived ones.
+
+TILE_GRID = int(os.environ.get('TILE_GRID_SIZE', 32))
+MAX_ZOOM = 18
+TILE_INDEX_TTL = float(os.environ.get('TILE_INDEX_TTL', 3600))
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def to_mercator(lat, lng):
+    """Returns normalized web-mercator (x, y) in [0, 1) for scalar or array coordinates."""
+    lat = np.clip(np.asarray(lat, dtype=np.float64), -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT)
+    lng = np.asarray(lng, dtype=np.float64)
+    x = (lng + 180.0) / 360.0
+    y = (1.0 - np.arcsinh(np.tan(np.radians(lat))) / math.pi) / 2.0
+    # Keep points on the antimeridian / south edge inside the last tile.
+    limit = np.nextafter(1.0, 0.0)
+    return np.clip(x, 0.0, limit), np.clip(y, 0.0, limit)
+
+
+class TileIndex:
+    """In-memory report coordinates plus per-zoom caches of binned tiles."""
+
+    def __init__(self, lats=(), lngs=()):
+        self._lock = threading.Lock()
+        x, y = to_mercator(lats, lngs)
+        self._x = np.array(x, dtype=np.float64, ndmin=1)
+        self._y = np.array(y, dtype=np.float64, ndmin=1)
+        self._size = len(self._x)
+        # zoom -> {(x, y): tile}; tiles missing from a level are empty.
+        self._levels = {}
+        # zoom -> tiles that gained points since the level was binned.
+        self._stale = {}
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    def load(cls, db):
+        """Builds an index from the coordinates of every report that has them."""
+        lats, lngs = [], []
+        for doc in db.collection('reports').select(['lat', 'lng']).stream():
+            data = doc.to_dict() or {}
+            lat, lng = data.get('lat'), data.get('lng')
+            if lat is not None and lng is not None:
+                lats.append(lat)
+                lngs.append(lng)
+        return cls(lats, lngs)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, lat, lng):
+        """Adds one report and invalidates the tile it falls in at every cached zoom."""
+        x, y = to_mercator(lat, lng)
+        with self._lock:
+            if self._size == len(self._x):
+                # Grow geometrically so appends stay amortized O(1).
+                capacity = max(2 * self._size, 1024)
+                self._x = np.resize(self._x, capacity)
+                self._y = np.resize(self._y, capacity)
+            self._x[self._size] = x
+            self._y[self._size] = y
+            self._size += 1
+            for zoom in self._levels:
+                scale = 1 << zoom
+                self._stale[zoom].add((int(x * scale), int(y * scale)))
+
+    def tile(self, zoom, tile_x, tile_y):
+        """Returns the density tile at zoom/x/y as a JSON-ready dict."""
+        with self._lock:
+            if zoom not in self._levels:
+                self._levels[zoom] = self._bin_level(zoom)
+                self._stale[zoom] = set()
+            level = self._levels[zoom]
+            key = (tile_x, tile_y)
+            if key in self._stale[zoom]:
+                self._stale[zoom].discard(key)
+                level[key] = self._bin_tile(zoom, tile_x, tile_y)
+            cells = level.get(key)
+        return {
+            'z': zoom, 'x': tile_x, 'y': tile_y, 'grid': TILE_GRID,
+            'total': int(cells[:, 2].sum()) if cells is not None else 0,
+            'max': int(cells[:, 2].max()) if cells is not None else 0,
+            'cells': cells.tolist() if cells is not None else [],
+        }
+
+    def _bin_level(self, zoom):
+        """Bins every point at `zoom` and returns {(x, y): cells} for non-empty tiles."""
+        if self._size == 0:
+            return {}
+        cells_per_axis = (1 << zoom) * TILE_GRID
+        col = (self._x[:self._size] * cells_per_axis).astype(np.int64)
+        row = (self._y[:self._size] * cells_per_axis).astype(np.int64)
+        # One key per global cell, ordered by tile so each tile is a contiguous run.
+        tile_key = (col // TILE_GRID) * (1 << zoom) + row // TILE_GRID
+        cell_key = (col % TILE_GRID) * TILE_GRID + row % TILE_GRID
+        keys, counts = np.unique(tile_key * TILE_GRID * TILE_GRID + cell_key, return_counts=True)
+        tiles, cells = np.divmod(keys, TILE_GRID * TILE_GRID)
+        triples = np.column_stack((cells // TILE_GRID, cells % TILE_GRID, counts))
+
+        level = {}
+        boundaries = np.flatnonzero(np.diff(tiles)) + 1
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(tiles)]):
+            tile_x, tile_y = divmod(int(tiles[start]), 1 << zoom)
+            level[(tile_x, tile_y)] = triples[start:end]
+        return level
+
+    def _bin_tile(self, zoom, tile_x, tile_y):
+        """Re-bins a single tile from the points inside it, or returns None if it is empty."""
+        scale = 1 << zoom
+        x = self._x[:self._size] * scale - tile_x
+        y = self._y[:self._size] * scale - tile_y
+        inside = (x >= 0) & (x < 1) & (y >= 0) & (y < 1)
+        if not inside.any():
+            return None
+        counts, _, _ = np.histogram2d(x[inside], y[inside], bins=TILE_GRID, range=[[0, 1], [0, 1]])
+        col, row = np.nonzero(counts)
+        return np.column_stack((col, row, counts[col, row].astype(np.int64)))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def tile_index(db):
+    """Returns the process-wide TileIndex, loading it on first use and after TILE_INDEX_TTL."""
+    global _index
+    with _index_lock:
+        if _index is None or time.monotonic() - _index.loaded_at > TILE_INDEX_TTL:
+            _index = TileIndex.load(db)
+        return _index
+
+
+def record_report(lat, lng):
+    """Adds a newly created report to the tile index, if one has been loaded."""
+    if lat is None or lng is None:
+        return
+    with _index_lock:
+        index = _index
+    if index is not None:
+        index.add(lat, lng)
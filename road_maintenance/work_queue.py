@@ -0,0 +1,92 @@
+# --- Materialized Work Queues ---
+# Crews only care about open reports in their own area, so alongside every
+# report we keep a small summary document in
+#   work_queues/{status}:{ward}/items/{report_id}
+# for each open status. Loading "my open jobs" is then one query per open
+# status against a tiny partition instead of a stream() over every report.
+# The queue entries are written in the same batch/transaction as the report
+# itself (see reports.py), so they never drift from the source of truth.
+# Functions here take report documents as produced by Report.to_firestore().
+
+OPEN_STATUSES = ('Reported', 'In Progress')
+UNASSIGNED_WARD = 'unassigned'
+GEOHASH_PRECISION = 5  # ~4.9km x 4.9km cells
+
+_GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(lat, lng, precision=GEOHASH_PRECISION):
+    """Encodes a coordinate pair as a geohash string of `precision` characters."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(geohash) < precision:
+        value, bounds = (lng, lng_range) if even else (lat, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            bounds[0] = mid
+        else:
+            bits <<= 1
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(geohash)
+
+
+def ward_for(report):
+    """Returns the work-queue partition a report belongs to.
+
+    An explicit ward wins; otherwise the geohash prefix of the report's
+    coordinates is used, and reports with neither go to UNASSIGNED_WARD.
+    """
+    ward = (report.get('ward') or '').strip()
+    if ward:
+        return ward.replace('/', '-')
+    lat, lng = report.get('lat'), report.get('lng')
+    if lat is not None and lng is not None:
+        return encode_geohash(lat, lng)
+    return UNASSIGNED_WARD
+
+
+def _items(db, status, ward):
+    return db.collection('work_queues').document(f"{status}:{ward}").collection('items')
+
+
+def _summary(report_id, report):
+    return {
+        'id': report_id,
+        'issue_type': report.get('issue_type'),
+        'location': report.get('location'),
+        'status': report.get('status'),
+        'ward': report.get('ward'),
+        'created_at': report.get('created_at'),
+    }
+
+
+def enqueue(writer, db, report_id, report):
+    """Adds the report's queue entry using `writer` (a WriteBatch or Transaction)."""
+    if report.get('status') in OPEN_STATUSES:
+        writer.set(_items(db, report['status'], report['ward']).document(report_id),
+                   _summary(report_id, report))
+
+
+def dequeue(writer, db, report_id, report):
+    """Removes the report's queue entry using `writer` (a WriteBatch or Transaction)."""
+    if report.get('status') in OPEN_STATUSES:
+        writer.delete(_items(db, report['status'], report['ward']).document(report_id))
+
+
+def load_open_jobs(db, ward):
+    """Returns the queue entries of every open status for a single ward."""
+    jobs = []
+    for status in OPEN_STATUSES:
+        jobs.extend(doc.to_dict() for doc in _items(db, status, ward).stream())
+    return jobs
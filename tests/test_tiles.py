@@ -0,0 +1,46 @@
+import numpy as np
+
+from road_maintenance import tiles
+
+
+def _as_dict(cells):
+    return {(int(col), int(row)): int(count) for col, row, count in cells}
+
+
+def test_empty_index_serves_empty_tiles():
+    index = tiles.TileIndex()
+    tile = index.tile(3, 1, 1)
+    assert tile['total'] == 0
+    assert tile['max'] == 0
+    assert tile['cells'] == []
+
+
+def test_single_point_lands_in_one_cell():
+    lat, lng = 12.97, 77.59
+    index = tiles.TileIndex([lat], [lng])
+    x, y = tiles.to_mercator(lat, lng)
+    zoom = 12
+    tile_x, tile_y = int(x * (1 << zoom)), int(y * (1 << zoom))
+    tile = index.tile(zoom, tile_x, tile_y)
+    assert tile['total'] == 1
+    assert len(tile['cells']) == 1
+    assert index.tile(zoom, tile_x + 1, tile_y)['total'] == 0
+
+
+def test_added_point_invalidates_cached_tile():
+    index = tiles.TileIndex()
+    assert index.tile(0, 0, 0)['total'] == 0
+    index.add(12.97, 77.59)
+    assert index.tile(0, 0, 0)['total'] == 1
+
+
+def test_level_binning_matches_per_tile_binning():
+    rng = np.random.default_rng(0)
+    lats = 12.97 + rng.normal(0, 0.05, 5000)
+    lngs = 77.59 + rng.normal(0, 0.05, 5000)
+    index = tiles.TileIndex(lats, lngs)
+    for zoom in (10, 12, 14):
+        level = index._bin_level(zoom)
+        assert sum(int(cells[:, 2].sum()) for cells in level.values()) == len(lats)
+        for (tile_x, tile_y), cells in level.items():
+            assert _as_dict(cells) == _as_dict(index._bin_tile(zoom, tile_x, tile_y))